@@ -0,0 +1,210 @@
+"""
+Admin accounts stored in the admins collection with bcrypt password hashes.
+
+Password checks run on a small dedicated thread pool (bcrypt releases the GIL
+while hashing), so a burst of logins queues there instead of blocking the
+event loop or the threads used by the rest of the app.
+
+Manage accounts from the command line:
+    python admin_accounts.py list
+    python admin_accounts.py add <email>
+    python admin_accounts.py passwd <email>
+    python admin_accounts.py remove <email>
+"""
+import argparse
+import asyncio
+import getpass
+import logging
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+
+import bcrypt
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+logger = logging.getLogger(__name__)
+
+# bcrypt only uses the first 72 bytes of a password
+BCRYPT_MAX_BYTES = 72
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def bcrypt_rounds() -> int:
+    """Work factor for new hashes; each step doubles the cost"""
+    return int(os.environ.get('ADMIN_BCRYPT_ROUNDS', '12'))
+
+
+def get_password_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=int(os.environ.get('ADMIN_AUTH_WORKERS', '2')),
+            thread_name_prefix="admin-auth",
+        )
+    return _executor
+
+
+def shutdown_password_executor():
+    global _executor
+    executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _password_bytes(password: str) -> bytes:
+    return password.encode("utf-8")[:BCRYPT_MAX_BYTES]
+
+
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
+    """Hash a password with bcrypt (blocking)"""
+    salt = bcrypt.gensalt(rounds=rounds or bcrypt_rounds())
+    return bcrypt.hashpw(_password_bytes(password), salt).decode("ascii")
+
+
+def check_password(password: str, password_hash: str) -> bool:
+    """Check a password against a bcrypt hash (blocking)"""
+    try:
+        return bcrypt.checkpw(_password_bytes(password), password_hash.encode("ascii"))
+    except ValueError:
+        return False
+
+
+def hash_rounds(password_hash: str) -> int:
+    """Work factor stored in a bcrypt hash ($2b$12$...)"""
+    return int(password_hash.split("$")[2])
+
+
+# Work factor -> hash checked when the email is unknown, so failed logins
+# cost the same as a wrong password for a real admin
+_dummy_hashes: Dict[int, str] = {}
+
+
+def _check_dummy_password(password: str) -> bool:
+    """Spend the time of a real password check (blocking)"""
+    rounds = bcrypt_rounds()
+    if rounds not in _dummy_hashes:
+        _dummy_hashes[rounds] = hash_password("not-a-real-password", rounds=rounds)
+    check_password(password, _dummy_hashes[rounds])
+    return False
+
+
+async def _run(func, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_password_executor(), func, *args)
+
+
+async def authenticate(db, email: str, password: str) -> Optional[str]:
+    """Verify admin credentials without blocking the event loop; returns the stored email, or None"""
+    admin = await db.admins.find_one({"email": email.strip().lower()}, {"_id": 0})
+    if admin is None:
+        await _run(_check_dummy_password, password)
+        return None
+
+    if not await _run(check_password, password, admin["password_hash"]):
+        return None
+
+    # Upgrade the hash when the configured work factor has changed
+    if hash_rounds(admin["password_hash"]) != bcrypt_rounds():
+        new_hash = await _run(hash_password, password)
+        await db.admins.update_one(
+            {"id": admin["id"]},
+            {"$set": {"password_hash": new_hash, "updated_at": datetime.now(timezone.utc).isoformat()}}
+        )
+    return admin["email"]
+
+
+async def set_admin_password(db, email: str, password: str) -> bool:
+    """Create the admin or replace its password; returns True if the account was created"""
+    email = email.strip().lower()
+    now = datetime.now(timezone.utc).isoformat()
+    password_hash = await _run(hash_password, password)
+    result = await db.admins.update_one(
+        {"email": email},
+        {
+            "$set": {"password_hash": password_hash, "updated_at": now},
+            "$setOnInsert": {"id": str(uuid.uuid4()), "email": email, "created_at": now},
+        },
+        upsert=True,
+    )
+    return result.upserted_id is not None
+
+
+async def ensure_bootstrap_admin(db):
+    """
+    Create the first admin from ADMIN_EMAIL / ADMIN_PASSWORD if the admins
+    collection is empty, so existing deployments keep working after upgrading.
+    """
+    email = os.environ.get('ADMIN_EMAIL')
+    password = os.environ.get('ADMIN_PASSWORD')
+    if not email or not password:
+        return
+    if await db.admins.count_documents({}, limit=1):
+        return
+    await set_admin_password(db, email, password)
+    logger.info(f"Created admin account for {email.strip().lower()} from environment")
+
+
+def _prompt_password() -> str:
+    password = getpass.getpass("Password: ")
+    if password != getpass.getpass("Confirm password: "):
+        raise SystemExit("Passwords do not match")
+    if len(password) < 8:
+        raise SystemExit("Password must be at least 8 characters")
+    return password
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Manage admin accounts")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("list", help="List admin accounts")
+    for command, help_text in [("add", "Create an admin account"), ("passwd", "Change an admin password"), ("remove", "Delete an admin account")]:
+        subparsers.add_parser(command, help=help_text).add_argument("email")
+    args = parser.parse_args()
+
+    mongo_url = os.environ.get('MONGO_URL')
+    db_name = os.environ.get('DB_NAME')
+
+    if not mongo_url or not db_name:
+        print("Error: MONGO_URL or DB_NAME not found in environment")
+        return
+
+    client = AsyncIOMotorClient(mongo_url)
+    db = client[db_name]
+
+    try:
+        if args.command == "list":
+            async for admin in db.admins.find({}, {"_id": 0, "email": 1, "created_at": 1}).sort("email", 1):
+                print(f"{admin['email']}  (created {admin.get('created_at', 'unknown')})")
+        elif args.command == "add":
+            if await db.admins.find_one({"email": args.email.strip().lower()}):
+                print(f"Admin {args.email} already exists. Use 'passwd' to change the password.")
+                return
+            await set_admin_password(db, args.email, _prompt_password())
+            print(f"Created admin {args.email}")
+        elif args.command == "passwd":
+            if not await db.admins.find_one({"email": args.email.strip().lower()}):
+                print(f"Admin {args.email} not found")
+                return
+            await set_admin_password(db, args.email, _prompt_password())
+            print(f"Updated password for {args.email}")
+        elif args.command == "remove":
+            if await db.admins.count_documents({}) <= 1:
+                print("Refusing to remove the last admin account")
+                return
+            result = await db.admins.delete_one({"email": args.email.strip().lower()})
+            print(f"Removed admin {args.email}" if result.deleted_count else f"Admin {args.email} not found")
+    finally:
+        shutdown_password_executor()
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,276 @@
+"""
+Write-time processing of blog post HTML.
+CMS writes pass the submitted content through process_content(), which keeps
+an allowlist of tags and attributes, collapses insignificant whitespace and
+gives h2/h3 headings anchor ids. The derived fields it returns (word count,
+read time, table of contents and plain text for search) are stored with the
+post, so public reads serve everything as stored. The submitted HTML is kept
+alongside as content_source.
+Posts written before processing existed, or by an older version of it, are
+reprocessed from their source at startup by ensure_processed_posts().
+"""
+import html
+import math
+import re
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+
+# Bump when the output of process_content() changes so stored posts are redone
+CONTENT_FORMAT = 2
+WORDS_PER_MINUTE = 200
+TOC_TAGS = {"h2": 2, "h3": 3}
+
+ALLOWED_TAGS = {
+    "p", "br", "hr", "h1", "h2", "h3", "h4", "h5", "h6", "ul", "ol", "li",
+    "strong", "b", "em", "i", "u", "s", "a", "img", "blockquote", "pre", "code",
+    "table", "thead", "tbody", "tr", "th", "td", "figure", "figcaption",
+    "span", "div", "sub", "sup",
+}
+VOID_TAGS = {"br", "hr", "img"}
+# Removed together with everything inside them
+DROP_CONTENT_TAGS = {
+    "script", "style", "iframe", "object", "noscript", "template", "svg", "math",
+    "head", "title", "textarea", "select", "button",
+}
+# Whitespace next to these never renders
+BLOCK_TAGS = {
+    "p", "br", "hr", "h1", "h2", "h3", "h4", "h5", "h6", "ul", "ol", "li",
+    "blockquote", "pre", "table", "thead", "tbody", "tr", "th", "td",
+    "figure", "figcaption", "div",
+}
+# Start tags that end an open <p>, as in the HTML parsing rules; <br> does not
+PARAGRAPH_CLOSING_TAGS = {
+    "p", "hr", "h1", "h2", "h3", "h4", "h5", "h6", "ul", "ol", "li",
+    "blockquote", "pre", "table", "figure", "figcaption", "div",
+}
+
+GLOBAL_ATTRS = {"id", "class", "style"}
+ALLOWED_ATTRS = {
+    "a": {"href", "title", "target", "rel"},
+    "img": {"src", "alt", "title", "width", "height"},
+    "ol": {"start"},
+    "th": {"colspan", "rowspan"},
+    "td": {"colspan", "rowspan"},
+}
+URL_ATTRS = {"href", "src"}
+SAFE_URL_SCHEMES = {"http", "https", "mailto", "tel"}
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_SCHEME_RE = re.compile(r"^([a-zA-Z][a-zA-Z0-9+.-]*):")
+# The editor's alignment buttons are the only inline style kept
+_TEXT_ALIGN_RE = re.compile(r"text-align\s*:\s*(left|right|center|justify)", re.IGNORECASE)
+# Post slugs become URL paths and static export directories
+_SLUG_RE = re.compile(r"^[a-z0-9]+(?:-[a-z0-9]+)*$")
+
+
+def _safe_url(value: str) -> Optional[str]:
+    # Browsers ignore control characters and whitespace inside a scheme
+    compact = re.sub(r"[\x00-\x20]", "", value)
+    scheme = _SCHEME_RE.match(compact)
+    if scheme and scheme.group(1).lower() not in SAFE_URL_SCHEMES:
+        return None
+    return value.strip()
+
+
+def _safe_style(value: str) -> Optional[str]:
+    match = _TEXT_ALIGN_RE.search(value)
+    return f"text-align: {match.group(1).lower()}" if match else None
+
+
+def is_valid_slug(slug: str) -> bool:
+    """Lowercase letters and digits in hyphen-separated words"""
+    return bool(_SLUG_RE.match(slug or ""))
+
+
+def slugify(text: str) -> str:
+    slug = re.sub(r"[^\w\s-]", "", text.lower())
+    return re.sub(r"[\s_-]+", "-", slug).strip("-") or "section"
+
+
+class _ContentProcessor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.out: List[str] = []
+        self.text: List[str] = []
+        self.toc: List[Dict] = []
+        self._open: List[str] = []
+        self._ids = set()
+        self._drop = 0
+        self._pre = 0
+        # Collapsed whitespace waiting to be written before the next inline content
+        self._space = False
+        self._at_block = True
+        # (tag, index of its start tag in out, explicit id, text parts) of the open h2/h3
+        self._heading = None
+
+    def _write_inline(self, piece: str):
+        if self._space and not self._at_block:
+            self.out.append(" ")
+        self._space = False
+        self._at_block = False
+        self.out.append(piece)
+
+    def _write_block(self, piece: str):
+        self._space = False
+        self._at_block = True
+        self.out.append(piece)
+        self.text.append(" ")
+
+    def _attributes(self, tag: str, attrs) -> Dict[str, str]:
+        allowed = GLOBAL_ATTRS | ALLOWED_ATTRS.get(tag, set())
+        clean = {}
+        for name, value in attrs:
+            name = name.lower()
+            if name not in allowed or value is None:
+                continue
+            if name in URL_ATTRS:
+                value = _safe_url(value)
+            elif name == "style":
+                value = _safe_style(value)
+            if value:
+                clean[name] = value
+        if tag == "a" and clean.get("target") == "_blank":
+            clean["rel"] = "noopener noreferrer"
+        if "id" in clean:
+            self._ids.add(clean["id"])
+        return clean
+
+    def handle_starttag(self, tag, attrs):
+        if self._drop or tag in DROP_CONTENT_TAGS:
+            if tag in DROP_CONTENT_TAGS:
+                self._drop += 1
+            return
+        if tag not in ALLOWED_TAGS:
+            return
+
+        # Unclosed <li> and <p> end where the next item or block starts
+        if self._open and (
+            (tag == "li" and self._open[-1] == "li")
+            or (tag in PARAGRAPH_CLOSING_TAGS and self._open[-1] == "p")
+        ):
+            self._close(self._open.pop())
+
+        attributes = self._attributes(tag, attrs)
+        piece = "<" + tag + "".join(
+            f' {name}="{html.escape(value)}"' for name, value in attributes.items()
+        ) + ">"
+        if tag in BLOCK_TAGS:
+            self._write_block(piece)
+        else:
+            self._write_inline(piece)
+
+        if tag in TOC_TAGS and self._heading is None:
+            self._heading = (tag, len(self.out) - 1, attributes, [])
+        if tag == "pre":
+            self._pre += 1
+        if tag not in VOID_TAGS:
+            self._open.append(tag)
+
+    def handle_endtag(self, tag):
+        if tag in DROP_CONTENT_TAGS:
+            self._drop = max(0, self._drop - 1)
+            return
+        if self._drop or tag not in self._open:
+            return
+        # Close anything left open inside this element as well
+        while self._open:
+            open_tag = self._open.pop()
+            self._close(open_tag)
+            if open_tag == tag:
+                break
+
+    def _close(self, tag: str):
+        if tag == "pre":
+            self._pre -= 1
+        if tag in BLOCK_TAGS:
+            self._write_block(f"</{tag}>")
+        else:
+            self.out.append(f"</{tag}>")
+        if self._heading is not None and self._heading[0] == tag:
+            self._finish_heading()
+
+    def _finish_heading(self):
+        tag, index, attributes, parts = self._heading
+        self._heading = None
+        title = " ".join("".join(parts).split())
+        if not title:
+            return
+        anchor = attributes.get("id")
+        if not anchor:
+            base = anchor = slugify(title)
+            suffix = 2
+            while anchor in self._ids:
+                anchor = f"{base}-{suffix}"
+                suffix += 1
+            self._ids.add(anchor)
+            attributes = {**attributes, "id": anchor}
+            self.out[index] = "<" + tag + "".join(
+                f' {name}="{html.escape(value)}"' for name, value in attributes.items()
+            ) + ">"
+        self.toc.append({"id": anchor, "title": title, "level": TOC_TAGS[tag]})
+
+    def handle_data(self, data):
+        if self._drop:
+            return
+        self.text.append(data)
+        if self._heading is not None:
+            self._heading[3].append(data)
+
+        if self._pre:
+            self._write_inline(html.escape(data, quote=False))
+            return
+        collapsed = _WHITESPACE_RE.sub(" ", data)
+        if collapsed.startswith(" "):
+            self._space = True
+            collapsed = collapsed[1:]
+        if not collapsed:
+            return
+        trailing = collapsed.endswith(" ")
+        self._write_inline(html.escape(collapsed.rstrip(" "), quote=False))
+        self._space = trailing
+
+    def close(self):
+        super().close()
+        while self._open:
+            self._close(self._open.pop())
+
+
+def read_time(word_count: int) -> str:
+    return f"{max(1, math.ceil(word_count / WORDS_PER_MINUTE))} min read"
+
+
+def process_content(content: str) -> dict:
+    """Sanitized, minified HTML plus the fields derived from it, ready to store on the post"""
+    processor = _ContentProcessor()
+    processor.feed(content or "")
+    processor.close()
+    text = " ".join("".join(processor.text).split())
+    word_count = len(text.split())
+    return {
+        "content": "".join(processor.out),
+        "content_source": content or "",
+        "text": text,
+        "word_count": word_count,
+        "read_time": read_time(word_count),
+        "toc": processor.toc,
+        "content_format": CONTENT_FORMAT,
+    }
+
+
+async def ensure_processed_posts(db) -> int:
+    """Reprocess posts stored raw or by an older CONTENT_FORMAT; returns the number updated"""
+    updated = 0
+    stale = db.blog_posts.find(
+        {"content_format": {"$ne": CONTENT_FORMAT}},
+        {"_id": 0, "id": 1, "content": 1, "content_source": 1},
+    )
+    async for post in stale:
+        # Posts from before content_source existed only have their content to go on
+        source = post["content_source"] if "content_source" in post else post.get("content")
+        # The version bump changes public ETags and tells the search index to re-read the post
+        await db.blog_posts.update_one(
+            {"id": post["id"]},
+            {"$set": process_content(source), "$inc": {"version": 1}},
+        )
+        updated += 1
+    return updated
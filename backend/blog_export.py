@@ -0,0 +1,328 @@
+"""
+Static snapshot export of the public blog.
+Renders the blog list, every post, one page per category, sitemap.xml and an
+RSS feed as JSON and HTML files with precompressed .gz (and .br, when the
+brotli package is installed) siblings, laid out so a static file server or
+CDN can serve them in place of the API:
+
+    blog/index.{json,html}                  blog list
+    blog/<slug>/index.{json,html}           post with its related posts
+    blog/categories/<category>/index.{json,html}
+    blog/rss.xml
+    sitemap.xml
+
+Exports are incremental: a post is only re-rendered when its CMS version or
+its related posts changed, and a file is only rewritten (and recompressed)
+when its bytes differ from the previous export. Files of deleted posts and
+emptied categories are removed.
+Run with:
+    python blog_export.py
+"""
+import asyncio
+import gzip
+import hashlib
+import html
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from blog_content import is_valid_slug, slugify
+from blog_related import build_neighbour_table
+from blog_search import SUMMARY_FIELDS, BlogSearchIndex
+from file_storage import FILE_MODE
+from http_cache import strong_etag
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+EXPORT_DIR = Path(os.environ.get('BLOG_EXPORT_DIR', str(ROOT_DIR / "static_blog")))
+SITE_URL = os.environ.get('SITE_URL', 'https://rushabhventures.com').rstrip("/")
+SITE_NAME = "Rushabh Ventures"
+RSS_ITEMS = 20
+MANIFEST_NAME = ".snapshot.json"
+
+# Fields of a post as served by GET /api/blog/{slug}
+POST_FIELDS = SUMMARY_FIELDS + ["content", "faqs", "word_count", "toc"]
+
+
+def _summary(post: dict) -> dict:
+    return {field: post.get(field) for field in SUMMARY_FIELDS}
+
+
+def _json(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _page(title: str, description: str, path: str, body: str) -> bytes:
+    return (
+        '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">'
+        '<meta name="viewport" content="width=device-width, initial-scale=1">'
+        f'<title>{html.escape(title)}</title>'
+        f'<meta name="description" content="{html.escape(description or "")}">'
+        f'<link rel="canonical" href="{html.escape(SITE_URL + path)}">'
+        f'<link rel="alternate" type="application/rss+xml" title="{SITE_NAME} Blog" href="{SITE_URL}/blog/rss.xml">'
+        f'</head><body>{body}</body></html>'
+    ).encode("utf-8")
+
+
+def _post_cards(posts: List[dict]) -> str:
+    return "<ul>" + "".join(
+        f'<li><a href="/blog/{html.escape(post["slug"])}/">{html.escape(post["title"])}</a>'
+        f'<p>{html.escape(post.get("excerpt") or "")}</p></li>'
+        for post in posts
+    ) + "</ul>"
+
+
+def render_post_html(post: dict, related: List[dict]) -> bytes:
+    meta = " · ".join(
+        html.escape(post.get(field) or "") for field in ("author", "date", "read_time") if post.get(field)
+    )
+    body = f'<article><h1>{html.escape(post["title"])}</h1><p>{meta}</p>'
+    if post.get("toc"):
+        body += '<nav><ol>' + "".join(
+            f'<li><a href="#{html.escape(entry["id"])}">{html.escape(entry["title"])}</a></li>'
+            for entry in post["toc"]
+        ) + '</ol></nav>'
+    # Stored content is already sanitized by blog_content
+    body += post.get("content") or ""
+    if post.get("faqs"):
+        body += '<section><h2>Frequently Asked Questions</h2>' + "".join(
+            f'<h3>{html.escape(faq["question"])}</h3><p>{html.escape(faq["answer"])}</p>'
+            for faq in post["faqs"]
+        ) + '</section>'
+    body += '</article>'
+    if related:
+        body += '<aside><h2>Related posts</h2>' + _post_cards(related) + '</aside>'
+    return _page(f'{post["title"]} | {SITE_NAME}', post.get("excerpt"), f'/blog/{post["slug"]}/', body)
+
+
+def render_list_html(title: str, path: str, posts: List[dict]) -> bytes:
+    return _page(f"{title} | {SITE_NAME}", f"{SITE_NAME} blog", path, f"<h1>{html.escape(title)}</h1>{_post_cards(posts)}")
+
+
+def render_sitemap(posts: List[dict], categories: Dict[str, List[dict]]) -> bytes:
+    def url(path: str, lastmod: Optional[str] = None) -> str:
+        entry = f"<url><loc>{html.escape(SITE_URL + path)}</loc>"
+        if lastmod:
+            entry += f"<lastmod>{html.escape(lastmod[:10])}</lastmod>"
+        return entry + "</url>"
+
+    latest = max((post.get("updated_at") or post["date"] for post in posts), default=None)
+    urls = [url("/blog/", latest)]
+    urls += [url(f'/blog/{post["slug"]}/', post.get("updated_at") or post["date"]) for post in posts]
+    urls += [url(f"/blog/categories/{category}/") for category in categories]
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">' + "".join(urls) + "</urlset>"
+    ).encode("utf-8")
+
+
+def render_rss(posts: List[dict]) -> bytes:
+    items = []
+    for post in posts[:RSS_ITEMS]:
+        link = html.escape(f'{SITE_URL}/blog/{post["slug"]}/')
+        published = datetime.strptime(post["date"], "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        items.append(
+            f'<item><title>{html.escape(post["title"])}</title><link>{link}</link>'
+            f'<guid isPermaLink="true">{link}</guid><pubDate>{format_datetime(published)}</pubDate>'
+            f'<category>{html.escape(post.get("category") or "")}</category>'
+            f'<description>{html.escape(post.get("excerpt") or "")}</description></item>'
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        f'<title>{SITE_NAME} Blog</title><link>{SITE_URL}/blog/</link>'
+        f'<description>Insights from the {SITE_NAME} team</description>' + "".join(items) + "</channel></rss>"
+    ).encode("utf-8")
+
+
+def _compressed_siblings(data: bytes) -> Dict[str, bytes]:
+    siblings = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        siblings[".br"] = brotli.compress(data, quality=11)
+    return siblings
+
+
+def _write_atomic(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=".export-")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            out.write(data)
+        # mkstemp creates 0600 files; the static server may run as another user
+        os.chmod(temp_name, FILE_MODE)
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
+def _target(export_dir: Path, relative: str) -> Path:
+    """export_dir / relative, refusing anything that resolves outside export_dir"""
+    root = export_dir.resolve()
+    path = (root / relative).resolve()
+    if path == root or not path.is_relative_to(root):
+        raise ValueError(f"Export path escapes {export_dir}: {relative!r}")
+    return path
+
+
+def _remove(path: Path, export_dir: Path):
+    for target in (path, path.with_name(path.name + ".gz"), path.with_name(path.name + ".br")):
+        target.unlink(missing_ok=True)
+    # Drop directories left empty, e.g. a deleted post's folder
+    parent = path.parent
+    while parent != export_dir.resolve() and parent.exists() and not any(parent.iterdir()):
+        parent.rmdir()
+        parent = parent.parent
+
+
+def _apply(export_dir: Path, files: Dict[str, bytes], kept: Dict[str, str], previous: Dict[str, str]) -> dict:
+    """Write changed files with their compressed siblings and remove stale ones (blocking)"""
+    hashes = dict(kept)
+    written = unchanged = 0
+    for relative, data in files.items():
+        digest = hashlib.sha256(data).hexdigest()
+        hashes[relative] = digest
+        path = _target(export_dir, relative)
+        if previous.get(relative) == digest and path.exists():
+            unchanged += 1
+            continue
+        _write_atomic(path, data)
+        for suffix, compressed in _compressed_siblings(data).items():
+            _write_atomic(path.with_name(path.name + suffix), compressed)
+        written += 1
+
+    removed = 0
+    for relative in previous.keys() - hashes.keys():
+        try:
+            path = _target(export_dir, relative)
+        except ValueError:
+            logger.warning(f"Not removing {relative!r} listed in the export manifest")
+            continue
+        _remove(path, export_dir)
+        removed += 1
+    return {"hashes": hashes, "written": written, "unchanged": unchanged + len(kept), "removed": removed}
+
+
+def _load_manifest(export_dir: Path) -> dict:
+    try:
+        return json.loads((export_dir / MANIFEST_NAME).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+async def export_blog_snapshot(db, export_dir: Path = EXPORT_DIR, neighbours: Optional[dict] = None) -> dict:
+    """
+    Bring the static snapshot in export_dir up to date with Mongo. neighbours is
+    the related-posts table to use; it is built from the posts when omitted.
+    """
+    posts = await db.blog_posts.find({}, {"_id": 0}).sort([("date", -1), ("id", -1)]).to_list(None)
+    # Slugs become paths; they are validated on CMS write but older posts may predate that
+    for post in posts:
+        if not is_valid_slug(post.get("slug")):
+            logger.warning(f"Not exporting blog post {post['id']} with invalid slug {post.get('slug')!r}")
+    posts = [post for post in posts if is_valid_slug(post.get("slug"))]
+    by_id = {post["id"]: post for post in posts}
+    if neighbours is None:
+        index = BlogSearchIndex()
+        for post in posts:
+            index.upsert(post)
+        neighbours = await asyncio.to_thread(build_neighbour_table, index)
+
+    manifest = await asyncio.to_thread(_load_manifest, export_dir)
+    previous_files = manifest.get("files", {})
+    previous_posts = manifest.get("posts", {})
+
+    files: Dict[str, bytes] = {}
+    kept: Dict[str, str] = {}
+    post_keys: Dict[str, str] = {}
+    rendered = 0
+    for post in posts:
+        related = [
+            _summary(by_id[related_id])
+            for related_id, _ in neighbours.get(post["id"], [])
+            if related_id in by_id
+        ]
+        # Related cards show other posts' titles, so their versions count too
+        key = strong_etag(
+            post["id"], post.get("version", 0),
+            *[f'{r["id"]}:{by_id[r["id"]].get("version", 0)}' for r in related],
+        )
+        post_keys[post["slug"]] = key
+        paths = [f'blog/{post["slug"]}/index.json', f'blog/{post["slug"]}/index.html']
+        if previous_posts.get(post["slug"]) == key and all(
+            path in previous_files and (export_dir / path).exists() for path in paths
+        ):
+            kept.update({path: previous_files[path] for path in paths})
+            continue
+        files[paths[0]] = _json({**{field: post.get(field) for field in POST_FIELDS}, "related": related})
+        files[paths[1]] = render_post_html(post, related)
+        rendered += 1
+
+    # The listing pages, sitemap and feed are cheap and depend on every post
+    summaries = [_summary(post) for post in posts]
+    categories: Dict[str, List[dict]] = {}
+    for summary in summaries:
+        if summary.get("category"):
+            categories.setdefault(slugify(summary["category"]), []).append(summary)
+
+    files["blog/index.json"] = _json(summaries)
+    files["blog/index.html"] = render_list_html(f"{SITE_NAME} Blog", "/blog/", summaries)
+    for category, category_posts in categories.items():
+        name = category_posts[0]["category"]
+        files[f"blog/categories/{category}/index.json"] = _json({"name": name, "posts": category_posts})
+        files[f"blog/categories/{category}/index.html"] = render_list_html(name, f"/blog/categories/{category}/", category_posts)
+    files["blog/rss.xml"] = render_rss(posts)
+    files["sitemap.xml"] = render_sitemap(posts, categories)
+
+    result = await asyncio.to_thread(_apply, export_dir, files, kept, previous_files)
+    await asyncio.to_thread(
+        _write_atomic, export_dir / MANIFEST_NAME, _json({"files": result["hashes"], "posts": post_keys})
+    )
+    return {
+        "posts_rendered": rendered,
+        "posts_unchanged": len(posts) - rendered,
+        "files_written": result["written"],
+        "files_unchanged": result["unchanged"],
+        "files_removed": result["removed"],
+    }
+
+
+async def main():
+    mongo_url = os.environ.get('MONGO_URL')
+    db_name = os.environ.get('DB_NAME')
+
+    if not mongo_url or not db_name:
+        print("Error: MONGO_URL or DB_NAME not found in environment")
+        return
+
+    client = AsyncIOMotorClient(mongo_url)
+    db = client[db_name]
+
+    result = await export_blog_snapshot(db)
+    print(f"Exported blog snapshot to {EXPORT_DIR}")
+    print(f"Posts rendered: {result['posts_rendered']} (unchanged: {result['posts_unchanged']})")
+    print(f"Files written: {result['files_written']} (unchanged: {result['files_unchanged']})")
+    print(f"Files removed: {result['files_removed']}")
+    if brotli is None:
+        print("brotli is not installed; only .gz siblings were written")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
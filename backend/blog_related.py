@@ -0,0 +1,86 @@
+"""
+Related-post recommendations.
+A TF-IDF matrix is built from the term frequencies already held by the blog
+search index, rows are L2-normalised so one matrix product gives the cosine
+similarity of every pair of posts, and the top matches for each post are
+kept in a neighbour table. The table is recomputed whenever a post changes,
+so serving related posts is a dictionary lookup.
+Only terms shared by at least two posts can link posts, so the vocabulary is
+limited to those, capped at the MAX_VOCABULARY rarest. snapshot_terms() copies
+them out of the live index on the event loop; compute_neighbour_table() does
+the matrix work and is safe to run in a worker thread.
+"""
+import heapq
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from blog_search import BlogSearchIndex
+
+RELATED_POSTS_K = 3
+# Pairs below this similarity are not worth linking
+MIN_SIMILARITY = 0.05
+# Terms in fewer posts than this cannot make two posts similar
+MIN_DOCUMENT_FREQUENCY = 2
+# Columns of the TF-IDF matrix; bounds its memory at posts x MAX_VOCABULARY floats
+MAX_VOCABULARY = 5000
+
+Postings = List[Dict[str, float]]
+
+
+def snapshot_terms(index: BlogSearchIndex) -> Tuple[List[str], Postings]:
+    """(post ids, {post id -> term frequency} per kept term), copied from the index"""
+    doc_ids, postings = index.term_frequencies()
+    shared = [docs for docs in postings.values() if len(docs) >= MIN_DOCUMENT_FREQUENCY]
+    if len(shared) > MAX_VOCABULARY:
+        # The rarest shared terms have the highest idf and say the most about similarity
+        shared = heapq.nsmallest(MAX_VOCABULARY, shared, key=len)
+    return doc_ids, [dict(docs) for docs in shared]
+
+
+def compute_neighbour_table(
+    doc_ids: List[str], postings: Postings, k: int = RELATED_POSTS_K
+) -> Dict[str, List[Tuple[str, float]]]:
+    """post id -> up to k (post id, cosine similarity) pairs, most similar first"""
+    n = len(doc_ids)
+    if n < 2 or not postings:
+        return {post_id: [] for post_id in doc_ids}
+
+    row = {post_id: i for i, post_id in enumerate(doc_ids)}
+    matrix = np.zeros((n, len(postings)), dtype=np.float32)
+    document_frequency = np.empty(len(postings), dtype=np.float32)
+    for column, doc_frequencies in enumerate(postings):
+        document_frequency[column] = len(doc_frequencies)
+        for post_id, frequency in doc_frequencies.items():
+            matrix[row[post_id], column] = frequency
+
+    # Sublinear term frequency with smoothed inverse document frequency
+    np.log1p(matrix, out=matrix)
+    matrix *= np.log((1 + n) / (1 + document_frequency)) + 1
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix /= np.where(norms == 0, 1, norms)
+
+    similarity = matrix @ matrix.T
+    np.fill_diagonal(similarity, -1)
+
+    k = min(k, n - 1)
+    # Unordered top k per row, then sort just those k
+    top = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(similarity, top, axis=1)
+    order = np.argsort(-top_scores, axis=1)
+    top = np.take_along_axis(top, order, axis=1)
+    top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+    return {
+        post_id: [
+            (doc_ids[j], round(float(score), 4))
+            for j, score in zip(top[i], top_scores[i])
+            if score >= MIN_SIMILARITY
+        ]
+        for i, post_id in enumerate(doc_ids)
+    }
+
+
+def build_neighbour_table(index: BlogSearchIndex, k: int = RELATED_POSTS_K) -> Dict[str, List[Tuple[str, float]]]:
+    """Neighbour table of an index that nothing else is writing to"""
+    return compute_neighbour_table(*snapshot_terms(index), k)
@@ -0,0 +1,225 @@
+"""
+In-memory full-text search over blog posts.
+Posts are tokenized into an inverted index (term -> post -> weighted term
+frequency) over the title, excerpt, FAQ questions/answers and the post body
+with its HTML stripped, and ranked with BM25. Queries are answered entirely
+from memory; CMS writes update the index for the affected post only, and
+refresh() picks up writes made by other server processes.
+"""
+import heapq
+import html
+import math
+import re
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+
+# Relative weight of a term occurrence in each field
+FIELD_WEIGHTS = {
+    "title": 3.0,
+    "excerpt": 2.0,
+    "faqs": 1.5,
+    "content": 1.0,
+}
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+SNIPPET_CHARS = 160
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "in",
+    "is", "it", "its", "of", "on", "or", "that", "the", "to", "was", "were", "will", "with",
+}
+
+# Fields copied from the post into each search hit
+SUMMARY_FIELDS = ["id", "slug", "title", "excerpt", "author", "date", "read_time", "category", "image"]
+
+_TOKEN_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+class _TextExtractor(HTMLParser):
+    SKIP_TAGS = {"script", "style"}
+    BLOCK_TAGS = {"p", "div", "br", "li", "ul", "ol", "h1", "h2", "h3", "h4", "h5", "h6", "tr", "td", "th", "blockquote", "section"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip += 1
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append(" ")
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append(" ")
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.parts.append(data)
+
+
+def strip_html(content: str) -> str:
+    """Visible text of an HTML fragment, with whitespace collapsed"""
+    if not content:
+        return ""
+    parser = _TextExtractor()
+    parser.feed(content)
+    parser.close()
+    return " ".join(html.unescape("".join(parser.parts)).split())
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+def post_fields(post: dict) -> Dict[str, str]:
+    """Searchable text of a post, by field"""
+    faqs = " ".join(
+        f"{faq.get('question', '')} {faq.get('answer', '')}" for faq in (post.get("faqs") or [])
+    )
+    return {
+        "title": post.get("title") or "",
+        "excerpt": post.get("excerpt") or "",
+        "faqs": faqs,
+        # Processed posts store their plain text
+        "content": post["text"] if "text" in post else strip_html(post.get("content") or ""),
+    }
+
+
+class BlogSearchIndex:
+    def __init__(self):
+        # term -> {post id -> weighted term frequency}
+        self._postings: Dict[str, Dict[str, float]] = {}
+        # post id -> (weighted length, terms, summary, plain body text, version)
+        self._docs: Dict[str, tuple] = {}
+        self._total_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def summary(self, post_id: str) -> Optional[dict]:
+        """Listing card fields of an indexed post"""
+        doc = self._docs.get(post_id)
+        return doc[2] if doc else None
+
+    def term_frequencies(self) -> Tuple[List[str], Dict[str, Dict[str, float]]]:
+        """(indexed post ids, term -> {post id -> weighted term frequency}); read-only views"""
+        return list(self._docs), self._postings
+
+    def versions(self) -> Dict[str, int]:
+        """Indexed post id -> CMS version"""
+        return {post_id: doc[4] for post_id, doc in self._docs.items()}
+
+    def upsert(self, post: dict):
+        """Add a post or replace its previous entry"""
+        self.remove(post["id"])
+        fields = post_fields(post)
+        frequencies: Dict[str, float] = {}
+        length = 0.0
+        for field, text in fields.items():
+            weight = FIELD_WEIGHTS[field]
+            for token in tokenize(text):
+                frequencies[token] = frequencies.get(token, 0.0) + weight
+                length += weight
+
+        for term, frequency in frequencies.items():
+            self._postings.setdefault(term, {})[post["id"]] = frequency
+        summary = {field: post.get(field) for field in SUMMARY_FIELDS}
+        self._docs[post["id"]] = (length, tuple(frequencies), summary, fields["content"], post.get("version", 0))
+        self._total_length += length
+
+    def remove(self, post_id: str):
+        doc = self._docs.pop(post_id, None)
+        if doc is None:
+            return
+        length, terms = doc[0], doc[1]
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(post_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= length
+
+    def search(self, query: str, category: Optional[str] = None, limit: int = 10) -> dict:
+        """Rank posts matching any query term; returns {"total": n, "results": [...]}"""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self._docs:
+            return {"total": 0, "results": []}
+
+        category = category.lower() if category else None
+        doc_count = len(self._docs)
+        avg_length = self._total_length / doc_count or 1.0
+        scores: Dict[str, float] = {}
+        for term in terms:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for post_id, frequency in postings.items():
+                length = self._docs[post_id][0]
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+                scores[post_id] = scores.get(post_id, 0.0) + idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+
+        if category:
+            scores = {
+                post_id: score for post_id, score in scores.items()
+                if (self._docs[post_id][2].get("category") or "").lower() == category
+            }
+
+        top = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        results = []
+        for post_id, score in top:
+            summary, body = self._docs[post_id][2], self._docs[post_id][3]
+            results.append({
+                **summary,
+                "score": round(score, 4),
+                "snippet": make_snippet(body or summary.get("excerpt") or "", terms),
+            })
+        return {"total": len(scores), "results": results}
+
+    async def refresh(self, db) -> int:
+        """
+        Re-index posts added, changed or removed since the index was last synced
+        with Mongo; returns the number of posts affected.
+        """
+        current = {
+            doc["id"]: doc.get("version", 0)
+            async for doc in db.blog_posts.find({}, {"_id": 0, "id": 1, "version": 1})
+        }
+        indexed = self.versions()
+        removed = indexed.keys() - current.keys()
+        for post_id in removed:
+            self.remove(post_id)
+        changed = [post_id for post_id, version in current.items() if indexed.get(post_id) != version]
+        if changed:
+            async for post in db.blog_posts.find({"id": {"$in": changed}}, {"_id": 0}):
+                self.upsert(post)
+        return len(removed) + len(changed)
+
+
+def make_snippet(text: str, terms: List[str], width: int = SNIPPET_CHARS) -> str:
+    """A window of text around the first query term it contains"""
+    lowered = text.lower()
+    start = -1
+    for match in _TOKEN_RE.finditer(lowered):
+        if match.group() in terms:
+            start = match.start()
+            break
+    if start < 0 or len(text) <= width:
+        snippet_start = 0
+    else:
+        snippet_start = max(0, min(start - width // 4, len(text) - width))
+        # Don't cut a word in half
+        space = text.rfind(" ", 0, snippet_start)
+        snippet_start = space + 1 if space >= 0 and snippet_start - space < 20 else snippet_start
+    snippet = text[snippet_start:snippet_start + width].strip()
+    if snippet_start + width < len(text):
+        snippet = snippet.rsplit(" ", 1)[0] + "…"
+    if snippet_start > 0:
+        snippet = "…" + snippet
+    return snippet
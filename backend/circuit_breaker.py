@@ -0,0 +1,94 @@
+"""
+Thread-safe circuit breaker for calls to an unreliable dependency (SMTP).
+After `failure_threshold` consecutive failures the circuit opens and calls are
+rejected immediately for `reset_timeout` seconds; then a single trial call is
+let through (half-open) and its outcome closes or re-opens the circuit.
+"""
+import threading
+import time
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the dependency while the circuit is open"""
+
+    def __init__(self, message: str, retry_in: float = 0.0):
+        super().__init__(message)
+        # Seconds until the breaker lets a trial call through
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 60):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_in_progress = False
+        self._total_failures = 0
+        self._total_rejections = 0
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead now; callers must report its outcome"""
+        with self._lock:
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    self._total_rejections += 1
+                    return False
+                self._state = self.HALF_OPEN
+                self._trial_in_progress = False
+            if self._state == self.HALF_OPEN:
+                if self._trial_in_progress:
+                    self._total_rejections += 1
+                    return False
+                self._trial_in_progress = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._consecutive_failures = 0
+            self._trial_in_progress = False
+
+    def record_failure(self):
+        with self._lock:
+            self._consecutive_failures += 1
+            self._total_failures += 1
+            self._trial_in_progress = False
+            if self._state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def call(self, func, *args, **kwargs):
+        """Run func through the breaker, raising CircuitOpenError if it is open"""
+        if not self.allow():
+            raise CircuitOpenError(f"Circuit '{self.name}' is open", self.snapshot()["retry_in_seconds"])
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+    def snapshot(self) -> dict:
+        """Current state and counters, for metrics"""
+        with self._lock:
+            retry_in = 0.0
+            if self._state == self.OPEN:
+                retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+            return {
+                "name": self.name,
+                "state": self._state,
+                "consecutive_failures": self._consecutive_failures,
+                "failure_threshold": self.failure_threshold,
+                "retry_in_seconds": round(retry_in, 1),
+                "total_failures": self._total_failures,
+                "total_rejections": self._total_rejections,
+            }
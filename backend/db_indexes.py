@@ -0,0 +1,120 @@
+"""
+MongoDB index bootstrap.
+Runs automatically on server startup and can also be run standalone:
+    python db_indexes.py
+Creating an index that already exists is a no-op, so this is safe to run repeatedly.
+"""
+import asyncio
+import logging
+import os
+from pathlib import Path
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import OperationFailure
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+logger = logging.getLogger(__name__)
+
+# collection -> list of (keys, options); every index is named so it can be reported
+INDEXES = {
+    "blog_posts": [
+        ([("slug", ASCENDING)], {"name": "slug_unique", "unique": True}),
+        ([("id", ASCENDING)], {"name": "id_unique", "unique": True}),
+        # Admin listing sort and public index keyset pagination
+        ([("date", DESCENDING), ("id", DESCENDING)], {"name": "date_id"}),
+        # Category listings and the category count aggregation
+        ([("category", ASCENDING), ("date", DESCENDING), ("id", DESCENDING)], {"name": "category_date_id"}),
+    ],
+    "contacts": [
+        ([("id", ASCENDING)], {"name": "id_unique", "unique": True}),
+        ([("created_at", DESCENDING), ("id", DESCENDING)], {"name": "created_at_id"}),
+        ([("status", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], {"name": "status_created_at_id"}),
+    ],
+    "applications": [
+        ([("id", ASCENDING)], {"name": "id_unique", "unique": True}),
+        ([("created_at", DESCENDING), ("id", DESCENDING)], {"name": "created_at_id"}),
+        ([("status", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], {"name": "status_created_at_id"}),
+    ],
+    "notification_outbox": [
+        ([("id", ASCENDING)], {"name": "id_unique", "unique": True}),
+        # Worker claim query and admin status counts
+        ([("status", ASCENDING), ("next_attempt_at", ASCENDING)], {"name": "status_next_attempt_at"}),
+        ([("created_at", DESCENDING)], {"name": "created_at"}),
+        # Remove sent entries, and the lead details in their payload, after the retention period
+        ([("expires_at", ASCENDING)], {
+            "name": "sent_expires_at_ttl",
+            "expireAfterSeconds": 0,
+            "partialFilterExpression": {"status": "sent"},
+        }),
+    ],
+    "admins": [
+        ([("email", ASCENDING)], {"name": "email_unique", "unique": True}),
+    ],
+    "files": [
+        ([("name", ASCENDING)], {"name": "name_unique", "unique": True}),
+        ([("created_at", DESCENDING), ("id", DESCENDING)], {"name": "created_at_id"}),
+        ([("type", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], {"name": "type_created_at_id"}),
+    ],
+    "rate_limits": [
+        # Drop idle buckets once they would have refilled completely
+        ([("expires_at", ASCENDING)], {"name": "expires_at_ttl", "expireAfterSeconds": 0}),
+    ],
+}
+
+
+async def ensure_indexes(db) -> list:
+    """
+    Create any missing indexes declared in INDEXES.
+    Returns the "collection.index_name" entries that were newly created.
+    A failure on one index (e.g. duplicate data blocking a unique index) is
+    logged and does not prevent the others from being created.
+    """
+    created = []
+    for collection_name, indexes in INDEXES.items():
+        collection = db[collection_name]
+        existing = set((await collection.index_information()).keys())
+        for keys, options in indexes:
+            name = options["name"]
+            if name in existing:
+                continue
+            try:
+                await collection.create_index(keys, **options)
+            except OperationFailure as e:
+                logger.error(f"Failed to create index {collection_name}.{name}: {str(e)}")
+                continue
+            created.append(f"{collection_name}.{name}")
+
+    if created:
+        logger.info(f"Created MongoDB indexes: {', '.join(created)}")
+    else:
+        logger.info("MongoDB indexes already up to date")
+    return created
+
+
+async def main():
+    mongo_url = os.environ.get('MONGO_URL')
+    db_name = os.environ.get('DB_NAME')
+
+    if not mongo_url or not db_name:
+        print("Error: MONGO_URL or DB_NAME not found in environment")
+        return
+
+    client = AsyncIOMotorClient(mongo_url)
+    db = client[db_name]
+
+    created = await ensure_indexes(db)
+    if created:
+        print(f"Created {len(created)} indexes: {', '.join(created)}")
+    else:
+        print("All indexes already exist. Nothing to do.")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
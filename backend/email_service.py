@@ -1,207 +1,179 @@
-import smtplib
 import os
+import asyncio
 import logging
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, NamedTuple, Optional, Tuple
+
+from smtp_pool import SMTPConnectionPool
+from circuit_breaker import CircuitBreaker
+from email_templates import CONTACT_TEMPLATE, APPLICATION_TEMPLATE, DIGEST_TEMPLATE
 
 logger = logging.getLogger(__name__)
 
-def send_contact_notification(contact_data: dict) -> bool:
+_smtp_pool = None
+_smtp_breaker = None
+_email_executor = None
+_email_executor_workers = 0
+# One token per email job submitted to the executor that has not started yet
+_email_waiting = set()
+_smtp_pool_lock = threading.Lock()
+
+
+class EmailSettings(NamedTuple):
+    gmail_user: str
+    gmail_password: str
+    notification_email: str
+
+
+_settings: Optional[EmailSettings] = None
+
+
+def get_email_settings() -> Optional[EmailSettings]:
     """
-    Send email notification when a contact form is submitted.
-    Uses Gmail SMTP with App Password.
+    Read the Gmail credentials and recipient once (on first use, after the server
+    has loaded .env). Returns None while the configuration is incomplete.
+    """
+    global _settings
+    if _settings is None:
+        settings = EmailSettings(
+            os.environ.get('GMAIL_USER'),
+            os.environ.get('GMAIL_APP_PASSWORD'),
+            os.environ.get('NOTIFICATION_EMAIL'),
+        )
+        if all(settings):
+            _settings = settings
+    return _settings
+
+
+def get_smtp_pool(gmail_user: str, gmail_password: str) -> SMTPConnectionPool:
+    """
+    Return the shared SMTP connection pool, creating it on first use.
+    Settings are read lazily so values loaded from .env by the server are picked up.
     """
-    gmail_user = os.environ.get('GMAIL_USER')
-    gmail_password = os.environ.get('GMAIL_APP_PASSWORD')
-    notification_email = os.environ.get('NOTIFICATION_EMAIL')
-    
-    if not all([gmail_user, gmail_password, notification_email]):
-        logger.error("Email configuration missing")
-        return False
-    
-    # Create HTML email content
-    html_content = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <style>
-            body {{ font-family: 'Inter', Arial, sans-serif; line-height: 1.6; color: #333; }}
-            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-            .header {{ background: linear-gradient(135deg, #0A192F 0%, #050d1a 100%); padding: 30px; text-align: center; }}
-            .header h1 {{ color: #D4AF37; margin: 0; font-family: 'Playfair Display', serif; }}
-            .content {{ background: #f9fafb; padding: 30px; }}
-            .field {{ margin-bottom: 15px; padding: 15px; background: #fff; border-left: 4px solid #D4AF37; }}
-            .field-label {{ font-weight: 700; color: #0A192F; text-transform: uppercase; font-size: 12px; letter-spacing: 1px; }}
-            .field-value {{ color: #333; font-size: 16px; margin-top: 5px; }}
-            .footer {{ background: #0A192F; padding: 20px; text-align: center; color: #9CA3AF; font-size: 12px; }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>RUSHABH VENTURES</h1>
-                <p style="color: #D4AF37; margin-top: 10px;">New Contact Form Submission</p>
-            </div>
-            <div class="content">
-                <div class="field">
-                    <div class="field-label">Name</div>
-                    <div class="field-value">{contact_data.get('name', 'N/A')}</div>
-                </div>
-                <div class="field">
-                    <div class="field-label">Company Name</div>
-                    <div class="field-value">{contact_data.get('company_name', 'N/A')}</div>
-                </div>
-                <div class="field">
-                    <div class="field-label">Annual Turnover</div>
-                    <div class="field-value">{contact_data.get('annual_turnover', 'N/A')} Crores</div>
-                </div>
-                <div class="field">
-                    <div class="field-label">Mobile Number</div>
-                    <div class="field-value">{contact_data.get('mobile_number', 'N/A')}</div>
-                </div>
-                <div class="field">
-                    <div class="field-label">Email</div>
-                    <div class="field-value">{contact_data.get('email', 'N/A')}</div>
-                </div>
-                <div class="field">
-                    <div class="field-label">Message</div>
-                    <div class="field-value">{contact_data.get('message', 'No message provided')}</div>
-                </div>
-            </div>
-            <div class="footer">
-                <p>This is an automated notification from Rushabh Ventures website.</p>
-            </div>
-        </div>
-    </body>
-    </html>
+    global _smtp_pool
+    with _smtp_pool_lock:
+        if _smtp_pool is None:
+            _smtp_pool = SMTPConnectionPool(
+                host=os.environ.get('SMTP_HOST', 'smtp.gmail.com'),
+                port=int(os.environ.get('SMTP_PORT', '587')),
+                username=gmail_user,
+                password=gmail_password,
+                size=int(os.environ.get('SMTP_POOL_SIZE', '2')),
+                use_tls=os.environ.get('SMTP_USE_TLS', 'true').lower() != 'false',
+                keepalive_interval=float(os.environ.get('SMTP_KEEPALIVE_SECONDS', '30')),
+                max_idle=float(os.environ.get('SMTP_MAX_IDLE_SECONDS', '240')),
+                connect_timeout=float(os.environ.get('SMTP_CONNECT_TIMEOUT_SECONDS', '10')),
+                send_timeout=float(os.environ.get('SMTP_SEND_TIMEOUT_SECONDS', '30')),
+            )
+        return _smtp_pool
+
+
+def get_smtp_breaker() -> CircuitBreaker:
+    """Circuit breaker guarding every SMTP send"""
+    global _smtp_breaker
+    with _smtp_pool_lock:
+        if _smtp_breaker is None:
+            _smtp_breaker = CircuitBreaker(
+                "smtp",
+                failure_threshold=int(os.environ.get('SMTP_BREAKER_FAILURE_THRESHOLD', '5')),
+                reset_timeout=float(os.environ.get('SMTP_BREAKER_RESET_SECONDS', '60')),
+            )
+        return _smtp_breaker
+
+
+def get_email_executor() -> ThreadPoolExecutor:
     """
-    
-    # Create message
-    msg = MIMEMultipart('alternative')
-    msg['Subject'] = f"New Contact: {contact_data.get('name', 'Unknown')} - {contact_data.get('company_name', 'Unknown Company')}"
-    msg['From'] = gmail_user
-    msg['To'] = notification_email
-    
-    # Plain text version
-    plain_text = f"""
-    New Contact Form Submission - Rushabh Ventures
-    
-    Name: {contact_data.get('name', 'N/A')}
-    Company Name: {contact_data.get('company_name', 'N/A')}
-    Annual Turnover: {contact_data.get('annual_turnover', 'N/A')} Crores
-    Mobile Number: {contact_data.get('mobile_number', 'N/A')}
-    Email: {contact_data.get('email', 'N/A')}
-    Message: {contact_data.get('message', 'No message provided')}
+    Dedicated bounded thread pool for blocking email work, so slow SMTP can
+    never tie up the threads shared with the rest of the app.
     """
-    
-    msg.attach(MIMEText(plain_text, 'plain'))
-    msg.attach(MIMEText(html_content, 'html'))
-    
+    global _email_executor, _email_executor_workers
+    with _smtp_pool_lock:
+        if _email_executor is None:
+            _email_executor_workers = int(os.environ.get('EMAIL_EXECUTOR_WORKERS', '2'))
+            _email_executor = ThreadPoolExecutor(
+                max_workers=_email_executor_workers,
+                thread_name_prefix="email",
+            )
+        return _email_executor
+
+
+async def run_in_email_executor(func, *args):
+    """Run a blocking email function on the dedicated email executor"""
+    token = object()
+
+    def run():
+        _email_waiting.discard(token)
+        return func(*args)
+
+    # set.add/discard are atomic, so the worker threads need no extra lock
+    _email_waiting.add(token)
+    loop = asyncio.get_running_loop()
     try:
-        # Connect to Gmail SMTP
-        server = smtplib.SMTP('smtp.gmail.com', 587)
-        server.starttls()
-        server.login(gmail_user, gmail_password)
-        server.sendmail(gmail_user, notification_email, msg.as_string())
-        server.quit()
-        logger.info(f"Email notification sent successfully for contact: {contact_data.get('name')}")
-        return True
-    except Exception as e:
-        logger.error(f"Failed to send email notification: {str(e)}")
-        return False
-
-
-def send_application_notification(application_data: dict) -> bool:
+        return await loop.run_in_executor(get_email_executor(), run)
+    finally:
+        # Jobs cancelled before they started never reach run()
+        _email_waiting.discard(token)
+
+
+def get_email_metrics() -> dict:
+    """Circuit breaker and executor state for the admin metrics endpoint"""
+    running = _email_executor is not None
+    return {
+        "smtp_circuit": get_smtp_breaker().snapshot(),
+        "executor_workers": _email_executor_workers if running else 0,
+        "executor_queued": len(_email_waiting) if running else 0,
+    }
+
+
+def close_smtp_pool():
+    """Close pooled SMTP connections and the email executor (called on server shutdown)"""
+    global _smtp_pool, _email_executor
+    with _smtp_pool_lock:
+        pool, _smtp_pool = _smtp_pool, None
+        executor, _email_executor = _email_executor, None
+    if pool is not None:
+        pool.close()
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _send_notification(template, data):
     """
-    Send email notification when an application form is submitted (homepage form).
+    Render a notification (or digest) template and send it over the shared SMTP
+    pool. Raises on failure so the outbox can record the reason and retry.
     """
-    gmail_user = os.environ.get('GMAIL_USER')
-    gmail_password = os.environ.get('GMAIL_APP_PASSWORD')
-    notification_email = os.environ.get('NOTIFICATION_EMAIL')
-    
-    if not all([gmail_user, gmail_password, notification_email]):
-        logger.error("Email configuration missing")
-        return False
-    
-    html_content = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <style>
-            body {{ font-family: 'Inter', Arial, sans-serif; line-height: 1.6; color: #333; }}
-            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-            .header {{ background: linear-gradient(135deg, #D4AF37 0%, #C5A028 100%); padding: 30px; text-align: center; }}
-            .header h1 {{ color: #000; margin: 0; font-family: 'Playfair Display', serif; }}
-            .content {{ background: #f9fafb; padding: 30px; }}
-            .field {{ margin-bottom: 15px; padding: 15px; background: #fff; border-left: 4px solid #0A192F; }}
-            .field-label {{ font-weight: 700; color: #0A192F; text-transform: uppercase; font-size: 12px; letter-spacing: 1px; }}
-            .field-value {{ color: #333; font-size: 16px; margin-top: 5px; }}
-            .highlight {{ background: #0A192F; color: #D4AF37; padding: 20px; text-align: center; margin-top: 20px; }}
-            .footer {{ background: #0A192F; padding: 20px; text-align: center; color: #9CA3AF; font-size: 12px; }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>RUSHABH VENTURES</h1>
-                <p style="color: #000; margin-top: 10px; font-weight: 600;">New IPO Evaluation Application</p>
-            </div>
-            <div class="content">
-                <div class="field">
-                    <div class="field-label">Applicant Name</div>
-                    <div class="field-value">{application_data.get('name', 'N/A')}</div>
-                </div>
-                <div class="field">
-                    <div class="field-label">Company Name</div>
-                    <div class="field-value">{application_data.get('company_name', 'N/A')}</div>
-                </div>
-                <div class="field">
-                    <div class="field-label">Annual Turnover</div>
-                    <div class="field-value">₹{application_data.get('annual_turnover', 'N/A')} Crores</div>
-                </div>
-                <div class="field">
-                    <div class="field-label">Mobile Number</div>
-                    <div class="field-value">{application_data.get('mobile_number', 'N/A')}</div>
-                </div>
-                <div class="highlight">
-                    <p style="margin: 0; font-size: 14px;">A potential client is waiting for your response!</p>
-                </div>
-            </div>
-            <div class="footer">
-                <p>This is an automated notification from Rushabh Ventures website.</p>
-            </div>
-        </div>
-    </body>
-    </html>
+    settings = get_email_settings()
+    if settings is None:
+        raise RuntimeError("Email configuration missing")
+
+    msg = template.build_message(data, settings.gmail_user, settings.notification_email)
+    pool = get_smtp_pool(settings.gmail_user, settings.gmail_password)
+    # Raises CircuitOpenError without touching the network while SMTP is failing
+    get_smtp_breaker().call(pool.send, settings.gmail_user, settings.notification_email, msg.as_string())
+
+
+def send_contact_notification(contact_data: dict) -> None:
     """
-    
-    msg = MIMEMultipart('alternative')
-    msg['Subject'] = f"🎯 New IPO Application: {application_data.get('company_name', 'Unknown')} - ₹{application_data.get('annual_turnover', 'N/A')} Cr"
-    msg['From'] = gmail_user
-    msg['To'] = notification_email
-    
-    plain_text = f"""
-    New IPO Evaluation Application - Rushabh Ventures
-    
-    Applicant Name: {application_data.get('name', 'N/A')}
-    Company Name: {application_data.get('company_name', 'N/A')}
-    Annual Turnover: ₹{application_data.get('annual_turnover', 'N/A')} Crores
-    Mobile Number: {application_data.get('mobile_number', 'N/A')}
-    
-    This applicant is interested in IPO evaluation services.
+    Send email notification when a contact form is submitted; raises on failure.
+    Uses Gmail SMTP with App Password.
     """
-    
-    msg.attach(MIMEText(plain_text, 'plain'))
-    msg.attach(MIMEText(html_content, 'html'))
-    
-    try:
-        server = smtplib.SMTP('smtp.gmail.com', 587)
-        server.starttls()
-        server.login(gmail_user, gmail_password)
-        server.sendmail(gmail_user, notification_email, msg.as_string())
-        server.quit()
-        logger.info(f"Application notification sent for: {application_data.get('company_name')}")
-        return True
-    except Exception as e:
-        logger.error(f"Failed to send application notification: {str(e)}")
-        return False
+    _send_notification(CONTACT_TEMPLATE, contact_data)
+    logger.info(f"Email notification sent successfully for contact: {contact_data.get('name')}")
+
+
+def send_application_notification(application_data: dict) -> None:
+    """
+    Send email notification when an application form is submitted (homepage form); raises on failure.
+    """
+    _send_notification(APPLICATION_TEMPLATE, application_data)
+    logger.info(f"Application notification sent for: {application_data.get('company_name')}")
+
+
+def send_digest_notification(items: List[Tuple[str, dict]]) -> None:
+    """
+    Send one email summarising several submissions; raises on failure.
+    items are (kind, data) pairs where kind is "contact" or "application".
+    """
+    _send_notification(DIGEST_TEMPLATE, items)
+    logger.info(f"Digest notification sent for {len(items)} submissions")
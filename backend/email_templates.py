@@ -0,0 +1,254 @@
+"""
+Notification email templates.
+Each template is compiled once at import: the static stylesheet/header and
+footer are rendered and base64-encoded up front, so sending a notification
+only renders and encodes the escaped field values.
+"""
+import base64
+import html
+from email.mime.multipart import MIMEMultipart
+from email.mime.nonmultipart import MIMENonMultipart
+from email.mime.text import MIMEText
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# base64 turns 57 input bytes into one 76-character line. Segments whose length
+# is a multiple of 57 bytes can therefore be encoded separately and concatenated.
+_B64_LINE_BYTES = 57
+
+BASE_STYLE = """
+            body { font-family: 'Inter', Arial, sans-serif; line-height: 1.6; color: #333; }
+            .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+            .header h1 { margin: 0; font-family: 'Playfair Display', serif; }
+            .content { background: #f9fafb; padding: 30px; }
+            .field { margin-bottom: 15px; padding: 15px; background: #fff; }
+            .field-label { font-weight: 700; color: #0A192F; text-transform: uppercase; font-size: 12px; letter-spacing: 1px; }
+            .field-value { color: #333; font-size: 16px; margin-top: 5px; }
+            .highlight { background: #0A192F; color: #D4AF37; padding: 20px; text-align: center; margin-top: 20px; }
+            .footer { background: #0A192F; padding: 20px; text-align: center; color: #9CA3AF; font-size: 12px; }"""
+
+FOOTER_TEXT = "This is an automated notification from Rushabh Ventures website."
+
+
+class Field(NamedTuple):
+    label: str
+    key: str
+    default: str = "N/A"
+    # Format for present values, e.g. "₹{} Crores"
+    format: str = "{}"
+
+
+def _value(data: dict, field: Field) -> str:
+    value = data.get(field.key)
+    if value is None or value == "":
+        return field.default
+    return field.format.format(value)
+
+
+def _header_value(value) -> str:
+    """Keep user input from breaking out of a single header line"""
+    return " ".join(str(value).split())
+
+
+def _document_head(theme_css: str, heading_style: str, heading: str) -> str:
+    return (
+        "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n<style>"
+        f"{BASE_STYLE}{theme_css}\n</style>\n</head>\n<body>\n"
+        "<div class=\"container\">\n<div class=\"header\">\n<h1>RUSHABH VENTURES</h1>\n"
+        f"<p style=\"{heading_style}\">{html.escape(heading)}</p>\n</div>\n<div class=\"content\">\n"
+    )
+
+
+def _document_tail(highlight: Optional[str] = None) -> str:
+    tail = ""
+    if highlight:
+        tail += f"<div class=\"highlight\">\n<p style=\"margin: 0; font-size: 14px;\">{html.escape(highlight)}</p>\n</div>\n"
+    return tail + f"</div>\n<div class=\"footer\">\n<p>{FOOTER_TEXT}</p>\n</div>\n</div>\n</body>\n</html>\n"
+
+
+def _encode_aligned(text: str) -> str:
+    """
+    Base64-encode text after padding it with trailing spaces to a whole number
+    of base64 lines, so the result can be concatenated with other such segments.
+    """
+    data = text.encode("utf-8")
+    data += b" " * (-len(data) % _B64_LINE_BYTES)
+    return "".join(
+        base64.b64encode(data[i:i + _B64_LINE_BYTES]).decode("ascii") + "\n"
+        for i in range(0, len(data), _B64_LINE_BYTES)
+    )
+
+
+class NotificationTemplate:
+    """A compiled notification email (subject, plain text and HTML parts)"""
+
+    def __init__(
+        self,
+        subject: str,
+        heading: str,
+        fields: List[Field],
+        theme_css: str,
+        heading_style: str,
+        plain_outro: str = "",
+        highlight: Optional[str] = None,
+    ):
+        self.subject = subject
+        self.heading = heading
+        self.fields = fields
+        self.plain_outro = plain_outro
+
+        self._head_b64 = _encode_aligned(_document_head(theme_css, heading_style, heading))
+        self._tail_b64 = _encode_aligned(_document_tail(highlight))
+        self._field_html = [
+            "<div class=\"field\">\n<div class=\"field-label\">" + html.escape(field.label) +
+            "</div>\n<div class=\"field-value\">{}</div>\n</div>\n"
+            for field in fields
+        ]
+        self._plain_head = f"{heading} - Rushabh Ventures\n\n"
+
+    def render_subject(self, data: dict) -> str:
+        return self.subject.format_map(_SubjectValues(data))
+
+    def render_plain(self, data: dict) -> str:
+        lines = [f"{field.label}: {_value(data, field)}" for field in self.fields]
+        text = self._plain_head + "\n".join(lines) + "\n"
+        if self.plain_outro:
+            text += f"\n{self.plain_outro}\n"
+        return text
+
+    def render_fields_html(self, data: dict) -> str:
+        return "".join(
+            chunk.format(html.escape(_value(data, field)))
+            for chunk, field in zip(self._field_html, self.fields)
+        )
+
+    def render_html_b64(self, data: dict) -> str:
+        """HTML body, already base64-encoded; only the field block is encoded per call"""
+        return self._head_b64 + _encode_aligned(self.render_fields_html(data)) + self._tail_b64
+
+    def build_message(self, data: dict, from_addr: str, to_addr: str) -> MIMEMultipart:
+        return _build_message(
+            self.render_subject(data), self.render_plain(data), self.render_html_b64(data),
+            from_addr, to_addr
+        )
+
+
+class DigestTemplate:
+    """One email summarising several notifications, each rendered with its own template"""
+
+    def __init__(self, templates: Dict[str, NotificationTemplate], labels: Dict[str, Tuple[str, str]], theme_css: str, heading_style: str):
+        self.templates = templates
+        # kind -> (singular, plural) used in the subject line
+        self.labels = labels
+        self._head_b64 = _encode_aligned(_document_head(theme_css, heading_style, "New Submissions Digest"))
+        self._tail_b64 = _encode_aligned(_document_tail())
+
+    def render_subject(self, items: List[Tuple[str, dict]]) -> str:
+        counts = {}
+        for kind, _ in items:
+            counts[kind] = counts.get(kind, 0) + 1
+        parts = [
+            f"{count} {self.labels[kind][0] if count == 1 else self.labels[kind][1]}"
+            for kind, count in counts.items()
+        ]
+        return f"📬 Digest: {len(items)} new submissions ({', '.join(parts)})"
+
+    def render_plain(self, items: List[Tuple[str, dict]]) -> str:
+        return "\n----------------------------------------\n\n".join(
+            self.templates[kind].render_plain(data) for kind, data in items
+        )
+
+    def render_html_b64(self, items: List[Tuple[str, dict]]) -> str:
+        sections = "".join(
+            f"<h2 class=\"section\">{html.escape(self.templates[kind].heading)}</h2>\n"
+            + self.templates[kind].render_fields_html(data)
+            for kind, data in items
+        )
+        return self._head_b64 + _encode_aligned(sections) + self._tail_b64
+
+    def build_message(self, items: List[Tuple[str, dict]], from_addr: str, to_addr: str) -> MIMEMultipart:
+        return _build_message(
+            self.render_subject(items), self.render_plain(items), self.render_html_b64(items),
+            from_addr, to_addr
+        )
+
+
+def _build_message(subject: str, plain_text: str, html_b64: str, from_addr: str, to_addr: str) -> MIMEMultipart:
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = subject
+    msg['From'] = from_addr
+    msg['To'] = to_addr
+
+    msg.attach(MIMEText(plain_text, 'plain', 'utf-8'))
+
+    html_part = MIMENonMultipart('text', 'html', charset='utf-8')
+    html_part['Content-Transfer-Encoding'] = 'base64'
+    html_part.set_payload(html_b64)
+    msg.attach(html_part)
+    return msg
+
+
+class _SubjectValues(dict):
+    """format_map source for subjects: single-line values with a fallback"""
+
+    def __init__(self, data: dict):
+        super().__init__()
+        self.data = data
+
+    def __missing__(self, key: str) -> str:
+        name, _, default = key.partition("|")
+        value = self.data.get(name)
+        return _header_value(value) if value not in (None, "") else (default or "N/A")
+
+
+CONTACT_TEMPLATE = NotificationTemplate(
+    subject="New Contact: {name|Unknown} - {company_name|Unknown Company}",
+    heading="New Contact Form Submission",
+    fields=[
+        Field("Name", "name"),
+        Field("Company Name", "company_name"),
+        Field("Annual Turnover", "annual_turnover", format="{} Crores"),
+        Field("Mobile Number", "mobile_number"),
+        Field("Email", "email"),
+        Field("Message", "message", default="No message provided"),
+    ],
+    theme_css="""
+            .header { background: linear-gradient(135deg, #0A192F 0%, #050d1a 100%); padding: 30px; text-align: center; }
+            .header h1 { color: #D4AF37; }
+            .field { border-left: 4px solid #D4AF37; }""",
+    heading_style="color: #D4AF37; margin-top: 10px;",
+)
+
+APPLICATION_TEMPLATE = NotificationTemplate(
+    subject="🎯 New IPO Application: {company_name|Unknown} - ₹{annual_turnover|N/A} Cr",
+    heading="New IPO Evaluation Application",
+    fields=[
+        Field("Applicant Name", "name"),
+        Field("Company Name", "company_name"),
+        Field("Annual Turnover", "annual_turnover", format="₹{} Crores"),
+        Field("Mobile Number", "mobile_number"),
+    ],
+    theme_css="""
+            .header { background: linear-gradient(135deg, #D4AF37 0%, #C5A028 100%); padding: 30px; text-align: center; }
+            .header h1 { color: #000; }
+            .field { border-left: 4px solid #0A192F; }""",
+    heading_style="color: #000; margin-top: 10px; font-weight: 600;",
+    plain_outro="This applicant is interested in IPO evaluation services.",
+    highlight="A potential client is waiting for your response!",
+)
+
+DIGEST_TEMPLATE = DigestTemplate(
+    templates={
+        "contact": CONTACT_TEMPLATE,
+        "application": APPLICATION_TEMPLATE,
+    },
+    labels={
+        "contact": ("contact", "contacts"),
+        "application": ("application", "applications"),
+    },
+    theme_css="""
+            .header { background: linear-gradient(135deg, #0A192F 0%, #050d1a 100%); padding: 30px; text-align: center; }
+            .header h1 { color: #D4AF37; }
+            .field { border-left: 4px solid #D4AF37; }
+            .section { color: #0A192F; font-family: 'Playfair Display', serif; font-size: 18px; margin: 30px 0 10px; border-bottom: 2px solid #D4AF37; }""",
+    heading_style="color: #D4AF37; margin-top: 10px;",
+)
@@ -0,0 +1,142 @@
+"""
+Uploaded file metadata index.
+Upload and delete keep one document per file in the files collection, so the
+admin file manager lists and counts files with indexed queries instead of
+scanning the upload directory.
+Bring the index back in line with what is actually on disk with:
+    python file_index.py
+"""
+import asyncio
+import os
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from file_storage import file_sha256
+from stats_counters import reconcile_counters
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+UPLOAD_DIR = ROOT_DIR / "uploads"
+
+IMAGE_EXTS = ['jpg', 'jpeg', 'png', 'gif', 'webp', 'svg', 'ico']
+DOC_EXTS = ['pdf', 'doc', 'docx', 'xls', 'xlsx', 'ppt', 'pptx', 'txt']
+FILE_TYPES = ['image', 'document', 'other']
+
+
+def get_file_type(filename: str) -> str:
+    """Get file type based on extension"""
+    ext = filename.lower().split('.')[-1] if '.' in filename else ''
+
+    if ext in IMAGE_EXTS:
+        return 'image'
+    elif ext in DOC_EXTS:
+        return 'document'
+    else:
+        return 'other'
+
+
+def file_document(
+    name: str,
+    size: int,
+    sha256: str,
+    created_at: Optional[str] = None,
+    uploader: Optional[str] = None,
+    content_type: Optional[str] = None,
+) -> dict:
+    return {
+        "id": str(uuid.uuid4()),
+        "name": name,
+        "size": size,
+        "type": get_file_type(name),
+        "content_type": content_type,
+        "sha256": sha256,
+        "uploader": uploader,
+        "created_at": created_at or datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def scan_upload_dir(upload_dir: Path = UPLOAD_DIR) -> dict:
+    """name -> os.stat_result for every uploaded file, skipping temp files and blobs (blocking)"""
+    if not upload_dir.exists():
+        return {}
+    with os.scandir(upload_dir) as entries:
+        return {
+            entry.name: entry.stat()
+            for entry in entries
+            if entry.is_file() and not entry.name.startswith(".")
+        }
+
+
+async def reconcile_file_index(db, upload_dir: Path = UPLOAD_DIR) -> dict:
+    """
+    Add documents for files on disk that are missing from the index, drop
+    documents whose file is gone and fix recorded sizes that no longer match.
+    """
+    on_disk = await asyncio.to_thread(scan_upload_dir, upload_dir)
+    indexed = {
+        doc["name"]: doc
+        async for doc in db.files.find({}, {"_id": 0, "name": 1, "size": 1})
+    }
+
+    added = 0
+    for name in on_disk.keys() - indexed.keys():
+        stat = on_disk[name]
+        sha256 = await asyncio.to_thread(file_sha256, upload_dir / name)
+        created_at = datetime.fromtimestamp(stat.st_mtime, timezone.utc).isoformat()
+        await db.files.update_one(
+            {"name": name},
+            {"$setOnInsert": file_document(name, stat.st_size, sha256, created_at)},
+            upsert=True,
+        )
+        added += 1
+
+    missing = list(indexed.keys() - on_disk.keys())
+    removed = (await db.files.delete_many({"name": {"$in": missing}})).deleted_count if missing else 0
+
+    updated = 0
+    for name in on_disk.keys() & indexed.keys():
+        if indexed[name].get("size") != on_disk[name].st_size:
+            sha256 = await asyncio.to_thread(file_sha256, upload_dir / name)
+            await db.files.update_one({"name": name}, {"$set": {"size": on_disk[name].st_size, "sha256": sha256}})
+            updated += 1
+
+    return {"added": added, "removed": removed, "updated": updated, "total": len(on_disk)}
+
+
+async def ensure_file_index(db, upload_dir: Path = UPLOAD_DIR):
+    """Build the index from disk on first start after upgrading"""
+    if await db.files.count_documents({}, limit=1) == 0:
+        await reconcile_file_index(db, upload_dir)
+
+
+async def main():
+    mongo_url = os.environ.get('MONGO_URL')
+    db_name = os.environ.get('DB_NAME')
+
+    if not mongo_url or not db_name:
+        print("Error: MONGO_URL or DB_NAME not found in environment")
+        return
+
+    client = AsyncIOMotorClient(mongo_url)
+    db = client[db_name]
+
+    result = await reconcile_file_index(db)
+    print(f"Files on disk: {result['total']}")
+    print(f"Added to index: {result['added']}")
+    print(f"Removed from index: {result['removed']}")
+    print(f"Size/hash updated: {result['updated']}")
+
+    # Keep the dashboard file count in step with the index, as the admin reconcile endpoint does
+    await reconcile_counters(db)
+
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
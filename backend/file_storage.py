@@ -0,0 +1,172 @@
+"""
+Upload storage helpers.
+Uploads are copied in chunks on a worker thread, hashed while they are
+written, and only become visible under their final name once complete, so
+readers never see a partially written file.
+
+Storage is content-addressed: each distinct content is kept once as a blob
+under .blobs/<sha256[:2]>/<sha256>, and every uploaded name is a hard link to
+its blob. The blob's link count is its reference count, so deleting a name
+only frees the space when no other name points at the same content.
+"""
+import asyncio
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, NamedTuple, Optional
+
+CHUNK_SIZE = 1024 * 1024
+TEMP_PREFIX = ".upload-"
+BLOB_DIR_NAME = ".blobs"
+
+
+def _current_umask() -> int:
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# mkstemp creates files readable by the owner only; stored files get the
+# permissions a plain open() would have given them
+FILE_MODE = 0o644 & ~_current_umask()
+
+
+class UploadTooLarge(Exception):
+    """The upload exceeded the configured maximum size"""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(f"Upload exceeds {max_bytes} bytes")
+        self.max_bytes = max_bytes
+
+
+class StoredFile(NamedTuple):
+    path: Path
+    size: int
+    sha256: str
+    # True when the content was already stored under another name
+    deduplicated: bool = False
+
+
+def safe_filename(filename: str) -> str:
+    """Strip any directory components a client put in the filename"""
+    return Path(filename.replace("\\", "/")).name or "upload"
+
+
+def is_stored_name(upload_dir: Path, filename: str) -> bool:
+    """Whether filename names a regular upload directly inside upload_dir"""
+    if not filename or filename != safe_filename(filename) or filename.startswith("."):
+        return False
+    return (upload_dir / filename).resolve().parent == upload_dir.resolve()
+
+
+def _copy_to_temp(source: BinaryIO, directory: Path, max_bytes: int, chunk_size: int) -> tuple:
+    """Copy source into a temp file in directory; returns (temp path, size, sha256 hex)"""
+    fd, temp_name = tempfile.mkstemp(dir=directory, prefix=TEMP_PREFIX)
+    temp_path = Path(temp_name)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = source.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(max_bytes)
+                digest.update(chunk)
+                out.write(chunk)
+            out.flush()
+            os.fchmod(out.fileno(), FILE_MODE)
+            os.fsync(out.fileno())
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    return temp_path, size, digest.hexdigest()
+
+
+def blob_path(directory: Path, sha256: str) -> Path:
+    return directory / BLOB_DIR_NAME / sha256[:2] / sha256
+
+
+def _write_file(source: BinaryIO, destination: Path, max_bytes: int, chunk_size: int) -> StoredFile:
+    directory = destination.parent
+    temp_path, size, sha256 = _copy_to_temp(source, directory, max_bytes, chunk_size)
+    blob = blob_path(directory, sha256)
+    try:
+        try:
+            # Same content already stored: just add a name for it
+            os.link(blob, destination)
+            return StoredFile(destination, size, sha256, deduplicated=True)
+        except FileNotFoundError:
+            pass
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(temp_path, blob)
+        try:
+            os.link(blob, destination)
+        except OSError:
+            # Filesystem without hard links: keep a plain copy under the name
+            os.replace(blob, destination)
+        return StoredFile(destination, size, sha256)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+
+async def store_upload(source: BinaryIO, destination: Path, max_bytes: int, chunk_size: int = CHUNK_SIZE) -> StoredFile:
+    """
+    Stream source into destination without blocking the event loop.
+    Raises UploadTooLarge (leaving nothing behind) once more than max_bytes have been read.
+    """
+    return await asyncio.to_thread(_write_file, source, destination, max_bytes, chunk_size)
+
+
+def file_sha256(path: Path, chunk_size: int = CHUNK_SIZE) -> str:
+    """SHA-256 hex digest of a file's content (blocking)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _delete_file(path: Path, sha256: Optional[str]) -> bool:
+    stat = path.stat()
+    blob = blob_path(path.parent, sha256 or file_sha256(path))
+    path.unlink()
+    try:
+        blob_stat = blob.stat()
+    except FileNotFoundError:
+        return False
+    # Only drop the blob if it is this file's content and no other name links to it
+    if blob_stat.st_ino == stat.st_ino and blob_stat.st_dev == stat.st_dev and blob_stat.st_nlink <= 1:
+        blob.unlink(missing_ok=True)
+        return True
+    return False
+
+
+async def delete_stored_file(path: Path, sha256: Optional[str] = None) -> bool:
+    """
+    Remove an uploaded name, and its blob if this was the last reference.
+    Pass sha256 when known to avoid re-hashing the file. Returns True if the blob was freed.
+    """
+    return await asyncio.to_thread(_delete_file, path, sha256)
+
+
+def remove_stale_temp_files(directory: Path) -> int:
+    """Delete temp files left by uploads interrupted by a crash"""
+    removed = 0
+    for path in directory.glob(f"{TEMP_PREFIX}*"):
+        path.unlink(missing_ok=True)
+        removed += 1
+    return removed
+
+
+def remove_orphan_blobs(directory: Path) -> int:
+    """Delete blobs no uploaded name links to any more, e.g. after a crash mid-upload"""
+    removed = 0
+    for blob in (directory / BLOB_DIR_NAME).glob("*/*"):
+        if blob.stat().st_nlink <= 1:
+            blob.unlink(missing_ok=True)
+            removed += 1
+    return removed
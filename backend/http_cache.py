@@ -0,0 +1,165 @@
+"""
+Helpers for HTTP conditional GET (ETag / Last-Modified validators and 304 responses)
+and single-range partial content (206) responses.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+
+import anyio
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+
+RANGE_CHUNK_SIZE = 64 * 1024
+
+
+def strong_etag(*parts) -> str:
+    """Build a quoted strong ETag from the given parts"""
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO date or datetime string stored on a document into an aware UTC datetime"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def latest(timestamps: Iterable[Optional[datetime]]) -> Optional[datetime]:
+    """Return the most recent of the given timestamps, ignoring missing ones"""
+    present = [ts for ts in timestamps if ts is not None]
+    return max(present) if present else None
+
+
+def http_date(value: datetime) -> str:
+    """Format a datetime as an RFC 7231 HTTP date"""
+    return format_datetime(value.astimezone(timezone.utc).replace(microsecond=0), usegmt=True)
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime] = None) -> dict:
+    """Response headers carrying the given validators"""
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """
+    Check the request's conditional headers against the current validators.
+    If-None-Match takes precedence over If-Modified-Since (RFC 7232 section 6).
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def not_modified_response(etag: str, last_modified: Optional[datetime] = None) -> Response:
+    """Empty 304 response carrying the validators"""
+    return Response(status_code=304, headers=validator_headers(etag, last_modified))
+
+
+class RangeNotSatisfiable(Exception):
+    """The requested byte range lies outside the resource"""
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a Range header into an inclusive (start, end) byte range.
+    Returns None when the whole resource should be sent (no header, another
+    unit, multiple ranges or a malformed value); raises RangeNotSatisfiable
+    when the range starts beyond the end of the resource.
+    """
+    if not header or not header.startswith("bytes="):
+        return None
+    spec = header[len("bytes="):].strip()
+    if "," in spec or "-" not in spec:
+        return None
+    first, _, last = spec.partition("-")
+    try:
+        if first.strip() == "":
+            # Suffix range: the last N bytes
+            length = int(last)
+            if length <= 0:
+                raise RangeNotSatisfiable()
+            return max(size - length, 0), size - 1
+        start = int(first)
+        end = int(last) if last.strip() else size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable()
+    if start > end:
+        return None
+    return start, min(end, size - 1)
+
+
+def if_range_matches(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """Whether a Range request may be honoured given its If-Range precondition"""
+    if_range = request.headers.get("if-range")
+    if if_range is None:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith('"'):
+        return if_range == etag
+    if last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_range)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) == since
+
+
+def range_not_satisfiable_response(size: int, headers: Optional[dict] = None) -> Response:
+    return Response(status_code=416, headers={**(headers or {}), "Content-Range": f"bytes */{size}"})
+
+
+def partial_file_response(path: Path, start: int, end: int, size: int, media_type: str, headers: Optional[dict] = None) -> StreamingResponse:
+    """206 response streaming bytes start..end (inclusive) of the file"""
+    length = end - start + 1
+
+    async def body():
+        async with await anyio.open_file(path, "rb") as f:
+            await f.seek(start)
+            remaining = length
+            while remaining > 0:
+                chunk = await f.read(min(RANGE_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+    return StreamingResponse(
+        body(),
+        status_code=206,
+        media_type=media_type,
+        headers={
+            **(headers or {}),
+            "Content-Range": f"bytes {start}-{end}/{size}",
+            "Content-Length": str(length),
+        },
+    )
@@ -0,0 +1,171 @@
+"""
+Resized image variants for uploaded images.
+Variants are rendered in a process pool (resizing is CPU-bound and would hold
+the GIL), written atomically under uploads/.variants/<filename>/ and then
+served as plain files. Uploads render every variant in the background; a
+request for a variant that is not there yet renders just that one.
+
+Requires Pillow. Without it, variants are unavailable and callers fall back
+to the original file.
+"""
+import asyncio
+import logging
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional
+
+from file_storage import is_stored_name
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+VARIANT_DIR_NAME = ".variants"
+VARIANT_WIDTHS = (320, 800, 1600)
+# Extension -> Pillow format for still raster images; SVG, ICO and (possibly
+# animated) GIF are always served as uploaded
+RESIZABLE_EXTS = {"jpg": "JPEG", "jpeg": "JPEG", "png": "PNG", "webp": "WEBP"}
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+
+_executor: Optional[ProcessPoolExecutor] = None
+# Variant path -> render in progress, so concurrent requests share one render
+_pending: Dict[Path, asyncio.Future] = {}
+
+
+def variants_available() -> bool:
+    return Image is not None
+
+
+def _ext(filename: str) -> str:
+    return filename.lower().rsplit(".", 1)[-1] if "." in filename else ""
+
+
+def is_resizable(filename: str) -> bool:
+    return _ext(filename) in RESIZABLE_EXTS
+
+
+def pick_width(requested: int) -> int:
+    """Smallest variant width covering the requested width, capped at the largest"""
+    for width in VARIANT_WIDTHS:
+        if width >= requested:
+            return width
+    return VARIANT_WIDTHS[-1]
+
+
+def _variant_dir(upload_dir: Path, filename: str) -> Path:
+    # Never let a crafted name point outside the variants of one upload
+    if not is_stored_name(upload_dir, filename):
+        raise ValueError(f"Invalid upload name: {filename!r}")
+    return upload_dir / VARIANT_DIR_NAME / filename
+
+
+def variant_path(upload_dir: Path, filename: str, width: int, webp: bool) -> Path:
+    ext = "webp" if webp else _ext(filename)
+    return _variant_dir(upload_dir, filename) / f"{width}.{ext}"
+
+
+def get_image_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=int(os.environ.get('IMAGE_WORKERS', '2')))
+    return _executor
+
+
+def shutdown_image_executor():
+    global _executor
+    executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def render_variant(source: str, destination: str, width: int, webp: bool):
+    """Resize source to at most `width` pixels wide and save it to destination (runs in a worker process)"""
+    destination = Path(destination)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    fmt = "WEBP" if webp else RESIZABLE_EXTS[_ext(source)]
+    with Image.open(source) as image:
+        # Camera photos are often stored sideways with an EXIF rotation flag
+        image = ImageOps.exif_transpose(image)
+        if image.width > width:
+            image.thumbnail((width, image.height), Image.LANCZOS)
+
+        save_options = {}
+        if fmt == "WEBP":
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA" if image.mode in ("LA", "PA", "P") else "RGB")
+            save_options = {"quality": WEBP_QUALITY, "method": 4}
+        elif fmt == "JPEG":
+            if image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            save_options = {"quality": JPEG_QUALITY, "optimize": True, "progressive": True}
+        elif fmt == "PNG":
+            save_options = {"optimize": True}
+
+        fd, temp_name = tempfile.mkstemp(dir=destination.parent, prefix=".variant-")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                image.save(out, format=fmt, **save_options)
+            os.replace(temp_name, destination)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+
+
+async def ensure_variant(upload_dir: Path, filename: str, width: int, webp: bool) -> Optional[Path]:
+    """Path of the requested variant, rendering it first if needed; None if it cannot be produced"""
+    if not variants_available() or not is_resizable(filename):
+        return None
+    destination = variant_path(upload_dir, filename, width, webp)
+    if destination.exists():
+        return destination
+
+    pending = _pending.get(destination)
+    if pending is None:
+        loop = asyncio.get_running_loop()
+        pending = asyncio.ensure_future(loop.run_in_executor(
+            get_image_executor(), render_variant,
+            str(upload_dir / filename), str(destination), width, webp,
+        ))
+        _pending[destination] = pending
+        pending.add_done_callback(lambda _: _pending.pop(destination, None))
+    try:
+        await asyncio.shield(pending)
+    except Exception as e:
+        logger.warning(f"Failed to render {width}px variant of {filename}: {str(e)}")
+        return None
+    return destination
+
+
+async def render_all_variants(upload_dir: Path, filename: str):
+    """Render every width in both the original format and WebP"""
+    for width in VARIANT_WIDTHS:
+        for webp in (False, True):
+            await ensure_variant(upload_dir, filename, width, webp)
+    # The file may have been deleted while its variants were rendering
+    if not (upload_dir / filename).exists():
+        await asyncio.to_thread(delete_variants, upload_dir, filename)
+
+
+def delete_variants(upload_dir: Path, filename: str):
+    """Remove all rendered variants of a file (blocking)"""
+    shutil.rmtree(_variant_dir(upload_dir, filename), ignore_errors=True)
+
+
+def remove_orphan_variants(upload_dir: Path) -> int:
+    """Remove variants whose original file no longer exists (blocking)"""
+    removed = 0
+    variant_root = upload_dir / VARIANT_DIR_NAME
+    if not variant_root.exists():
+        return 0
+    for entry in variant_root.iterdir():
+        if not (upload_dir / entry.name).exists():
+            shutil.rmtree(entry, ignore_errors=True)
+            removed += 1
+    return removed
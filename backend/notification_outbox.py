@@ -0,0 +1,322 @@
+"""
+Durable notification outbox.
+Request handlers only insert a document into the notification_outbox collection;
+a background asyncio worker claims due entries, sends them with bounded
+concurrency, retries failures with exponential backoff and dead-letters
+entries that keep failing (status "failed") for an admin to inspect and retry.
+Sent entries, which still hold the lead's details in their payload, are given
+an expires_at date `sent_retention` seconds ahead and removed by a TTL index.
+
+In digest mode, normal-priority entries are held back and sent together as one
+email once the oldest has waited `digest_window` seconds or `digest_max_items`
+have piled up; high-priority entries are still sent immediately.
+"""
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timezone, timedelta
+from typing import Callable, Dict, List, Optional
+
+from pymongo import ReturnDocument
+
+from circuit_breaker import CircuitOpenError
+from email_service import (
+    send_contact_notification, send_application_notification, send_digest_notification,
+    run_in_email_executor,
+)
+
+logger = logging.getLogger(__name__)
+
+# Notification kind -> blocking sender that raises on failure
+SENDERS: Dict[str, Callable[[dict], None]] = {
+    "contact": send_contact_notification,
+    "application": send_application_notification,
+}
+
+OUTBOX_STATUSES = ["pending", "sending", "sent", "failed"]
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _describe(error: Exception) -> str:
+    # Some exceptions (e.g. timeouts) have an empty message
+    return str(error) or type(error).__name__
+
+
+async def enqueue_notification(db, kind: str, payload: dict, priority: str = "normal") -> dict:
+    """
+    Record a notification to be sent by the outbox worker.
+    "high" priority entries bypass digest mode.
+    """
+    now = _now().isoformat()
+    doc = {
+        "id": str(uuid.uuid4()),
+        "kind": kind,
+        "priority": priority,
+        "payload": {k: v for k, v in payload.items() if k != '_id'},
+        "status": "pending",
+        "attempts": 0,
+        "next_attempt_at": now,
+        "lease_expires_at": None,
+        "last_error": None,
+        "created_at": now,
+        "updated_at": now,
+        "sent_at": None,
+    }
+    await db.notification_outbox.insert_one(doc)
+    return doc
+
+
+async def retry_notification(db, notification_id: str) -> Optional[dict]:
+    """Move a dead-lettered notification back to pending; returns None if it is not failed"""
+    now = _now().isoformat()
+    return await db.notification_outbox.find_one_and_update(
+        {"id": notification_id, "status": "failed"},
+        {"$set": {"status": "pending", "attempts": 0, "next_attempt_at": now, "updated_at": now}},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+class OutboxWorker:
+    """
+    Drains the outbox in the background.
+
+    Entries are claimed atomically with a lease, so several server processes can
+    share one outbox and an entry whose process died mid-send is picked up again
+    once the lease expires.
+    """
+
+    def __init__(
+        self,
+        db,
+        concurrency: int = 2,
+        max_attempts: int = 6,
+        backoff_base: float = 30,
+        backoff_max: float = 3600,
+        poll_interval: float = 10,
+        lease_seconds: float = 120,
+        digest_window: float = 0,
+        digest_max_items: int = 20,
+        sent_retention: float = 7 * 86400,
+    ):
+        self.db = db
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.digest_window = digest_window
+        self.digest_max_items = digest_max_items
+        self.sent_retention = sent_retention
+        self._slots = asyncio.Semaphore(concurrency)
+        self._wakeup = asyncio.Event()
+        self._digest_wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self._in_flight = set()
+
+    @property
+    def digest_enabled(self) -> bool:
+        return self.digest_window > 0
+
+    def start(self):
+        if not self._tasks:
+            self._tasks.append(asyncio.create_task(self._run()))
+            if self.digest_enabled:
+                self._tasks.append(asyncio.create_task(self._run_digest()))
+
+    async def stop(self, timeout: float = 10):
+        """Stop claiming new entries and give in-flight sends a chance to finish"""
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        if self._in_flight:
+            # Unfinished entries keep their lease and are retried after it expires
+            await asyncio.wait(self._in_flight, timeout=timeout)
+
+    def notify(self):
+        """Wake the worker immediately instead of waiting for the next poll"""
+        self._wakeup.set()
+        self._digest_wakeup.set()
+
+    def backoff(self, attempts: int) -> float:
+        """Delay before the next attempt after `attempts` failures"""
+        return min(self.backoff_base * (2 ** (attempts - 1)), self.backoff_max)
+
+    async def _run(self):
+        while True:
+            await self._slots.acquire()
+            try:
+                entry = await self._claim()
+            except Exception as e:
+                self._slots.release()
+                logger.error(f"Failed to claim outbox entry: {str(e)}")
+                await asyncio.sleep(self.poll_interval)
+                continue
+
+            if entry is None:
+                self._slots.release()
+                await self._wait()
+                continue
+
+            task = asyncio.create_task(self._deliver(entry))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _run_digest(self):
+        while True:
+            try:
+                batch = await self._claim_digest_batch()
+            except Exception as e:
+                logger.error(f"Failed to claim outbox digest batch: {str(e)}")
+                batch = None
+
+            if not batch:
+                await self._wait(self._digest_wakeup, min(self.poll_interval, self.digest_window))
+                continue
+
+            await self._slots.acquire()
+            task = asyncio.create_task(self._deliver_digest(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _wait(self, event: Optional[asyncio.Event] = None, timeout: Optional[float] = None):
+        event = event or self._wakeup
+        event.clear()
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout or self.poll_interval)
+        except asyncio.TimeoutError:
+            pass
+
+    def _due_query(self, now: datetime) -> dict:
+        """Entries ready to be (re)tried: due pending ones and ones whose lease expired"""
+        return {"$or": [
+            {"status": "pending", "next_attempt_at": {"$lte": now.isoformat()}},
+            {"status": "sending", "lease_expires_at": {"$lte": now.isoformat()}},
+        ]}
+
+    def _lease(self, now: datetime) -> dict:
+        return {
+            "status": "sending",
+            "lease_expires_at": (now + timedelta(seconds=self.lease_seconds)).isoformat(),
+            "updated_at": now.isoformat(),
+        }
+
+    async def _claim(self) -> Optional[dict]:
+        now = _now()
+        query = self._due_query(now)
+        if self.digest_enabled:
+            # Normal-priority entries are left for the digest loop
+            query = {"$and": [query, {"priority": {"$ne": "normal"}}]}
+        return await self.db.notification_outbox.find_one_and_update(
+            query,
+            {"$set": self._lease(now)},
+            sort=[("next_attempt_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def _claim_digest_batch(self) -> List[dict]:
+        """Claim up to digest_max_items normal-priority entries once the digest is due"""
+        now = _now()
+        query = {"$and": [self._due_query(now), {"priority": "normal"}]}
+        candidates = await self.db.notification_outbox.find(query, {"_id": 0, "id": 1, "created_at": 1}) \
+            .sort("created_at", 1).limit(self.digest_max_items).to_list(self.digest_max_items)
+        if not candidates:
+            return []
+
+        oldest_age = (now - datetime.fromisoformat(candidates[0]["created_at"])).total_seconds()
+        if len(candidates) < self.digest_max_items and oldest_age < self.digest_window:
+            return []
+
+        batch_id = str(uuid.uuid4())
+        ids = [c["id"] for c in candidates]
+        await self.db.notification_outbox.update_many(
+            {"$and": [query, {"id": {"$in": ids}}]},
+            {"$set": {**self._lease(now), "batch_id": batch_id}},
+        )
+        # Another process may have claimed some of the candidates first
+        return await self.db.notification_outbox.find({"batch_id": batch_id}, {"_id": 0}) \
+            .sort("created_at", 1).to_list(len(ids))
+
+    async def _deliver(self, entry: dict):
+        try:
+            error = None
+            sender = SENDERS.get(entry["kind"])
+            if sender is None:
+                error = f"Unknown notification kind: {entry['kind']}"
+            else:
+                try:
+                    await run_in_email_executor(sender, entry["payload"])
+                except CircuitOpenError as e:
+                    # Nothing was attempted, so this does not count against the entry
+                    await self._postpone(entry, e)
+                    return
+                except Exception as e:
+                    error = _describe(e)
+            await self._record_result(entry, error)
+        except Exception as e:
+            logger.error(f"Failed to record outbox result for {entry['id']}: {str(e)}")
+        finally:
+            self._slots.release()
+
+    async def _deliver_digest(self, batch: List[dict]):
+        try:
+            error = None
+            try:
+                items = [(entry["kind"], entry["payload"]) for entry in batch]
+                await run_in_email_executor(send_digest_notification, items)
+            except CircuitOpenError as e:
+                await asyncio.gather(*[self._postpone(entry, e) for entry in batch])
+                return
+            except Exception as e:
+                error = _describe(e)
+            await asyncio.gather(*[self._record_result(entry, error) for entry in batch])
+        except Exception as e:
+            logger.error(f"Failed to record outbox digest result: {str(e)}")
+        finally:
+            self._slots.release()
+
+    async def _postpone(self, entry: dict, rejection: CircuitOpenError):
+        """Put an entry back until the SMTP circuit lets a trial send through, keeping its attempt count"""
+        now = _now()
+        delay = max(rejection.retry_in, self.poll_interval)
+        await self.db.notification_outbox.update_one({"id": entry["id"]}, {"$set": {
+            "status": "pending",
+            "next_attempt_at": (now + timedelta(seconds=delay)).isoformat(),
+            "last_error": str(rejection),
+            "lease_expires_at": None,
+            "updated_at": now.isoformat(),
+        }})
+
+    async def _record_result(self, entry: dict, error: Optional[str]):
+        now = _now()
+        if error is None:
+            update = {
+                "status": "sent",
+                "sent_at": now.isoformat(),
+                "last_error": None,
+                # TTL indexes only act on BSON dates, not the ISO strings used elsewhere
+                "expires_at": now + timedelta(seconds=self.sent_retention),
+            }
+        else:
+            attempts = entry["attempts"] + 1
+            update = {"attempts": attempts, "last_error": error}
+            if attempts >= self.max_attempts:
+                update["status"] = "failed"
+                logger.error(f"Notification {entry['id']} dead-lettered after {attempts} attempts: {error}")
+            else:
+                delay = self.backoff(attempts)
+                update["status"] = "pending"
+                update["next_attempt_at"] = (now + timedelta(seconds=delay)).isoformat()
+                logger.warning(f"Notification {entry['id']} failed (attempt {attempts}), retrying in {delay:.0f}s: {error}")
+
+        update.update({"lease_expires_at": None, "updated_at": now.isoformat()})
+        await self.db.notification_outbox.update_one({"id": entry["id"]}, {"$set": update})
@@ -0,0 +1,113 @@
+"""
+Token-bucket rate limiting for public write endpoints.
+
+Each (route, client) pair gets a bucket holding up to `burst` tokens that
+refills at `per_minute` tokens a minute; a request spends one token or is
+rejected with the number of seconds until the next token is available.
+
+MemoryRateLimiter keeps buckets in the process. MongoRateLimiter stores them
+in the rate_limits collection so every worker shares the same budget; it uses
+the equivalent GCRA form of the bucket (one "theoretical arrival time" per
+key) so each check is a conditional atomic update with no read-modify-write race.
+"""
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from pymongo.errors import DuplicateKeyError
+
+
+class RateLimit:
+    """Bucket size and refill rate for one route"""
+
+    def __init__(self, per_minute: float, burst: int):
+        self.per_minute = per_minute
+        self.burst = burst
+
+    @property
+    def interval(self) -> float:
+        """Seconds to refill one token"""
+        return 60.0 / self.per_minute
+
+
+class MemoryRateLimiter:
+    """In-process token buckets, evicting the least recently used keys beyond max_keys"""
+
+    def __init__(self, max_keys: int = 10000):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets: "OrderedDict[str, tuple]" = OrderedDict()
+
+    async def hit(self, key: str, limit: RateLimit) -> float:
+        """Spend a token; returns 0 if allowed, otherwise seconds until retry"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (limit.burst, now))
+            tokens = min(limit.burst, tokens + (now - updated) / limit.interval)
+            retry_after = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                retry_after = (1 - tokens) * limit.interval
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return retry_after
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class MongoRateLimiter:
+    """Buckets shared through MongoDB; documents expire via a TTL index on expires_at"""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def hit(self, key: str, limit: RateLimit) -> float:
+        now = time.time()
+        tolerance = limit.burst * limit.interval
+        expires_at = datetime.fromtimestamp(now + tolerance, timezone.utc)
+
+        # Bucket missing or full: start it one token down
+        # (the upsert fails with a duplicate key when the bucket exists but is not full)
+        try:
+            await self.collection.update_one(
+                {"_id": key, "tat": {"$lt": now}},
+                {"$set": {"tat": now + limit.interval, "expires_at": expires_at}},
+                upsert=True,
+            )
+            return 0.0
+        except DuplicateKeyError:
+            pass
+
+        # Tokens left: push the arrival time one interval further
+        if await self.collection.find_one_and_update(
+            {"_id": key, "tat": {"$lte": now + tolerance - limit.interval}},
+            {"$inc": {"tat": limit.interval}, "$set": {"expires_at": expires_at}},
+        ) is not None:
+            return 0.0
+
+        doc = await self.collection.find_one({"_id": key})
+        if doc is None:
+            return 0.0
+        return max(doc["tat"] + limit.interval - tolerance - now, 0.0)
+
+
+def client_ip(request, trusted_hops: int = 0) -> str:
+    """
+    Client address. Behind trusted_hops proxies, each appending to
+    X-Forwarded-For, it is the entry the outermost proxy appended; anything
+    to its left came from the client and could be forged.
+    """
+    if trusted_hops > 0:
+        hops = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+        if len(hops) >= trusted_hops:
+            return hops[-trusted_hops]
+    return request.client.host if request.client else "unknown"
+
+
+def retry_after_header(seconds: float) -> str:
+    return str(max(1, int(seconds + 0.999)))
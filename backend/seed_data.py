@@ -9,6 +9,9 @@ from dotenv import load_dotenv
 from pathlib import Path
 import uuid
 
+from blog_content import process_content
+from stats_counters import reconcile_counters
+
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
@@ -245,10 +248,14 @@ async def seed_blog_data():
         client.close()
         return
     
-    # Insert blog posts
-    result = await db.blog_posts.insert_many(BLOG_POSTS)
+    # Insert blog posts with their content processed as the CMS would
+    posts = [{**post, **process_content(post["content"]), "version": 1} for post in BLOG_POSTS]
+    result = await db.blog_posts.insert_many(posts)
     print(f"Successfully seeded {len(result.inserted_ids)} blog posts")
     
+    # The dashboard counters are only initialised once, so bring them up to date
+    await reconcile_counters(db)
+    
     client.close()
 
 
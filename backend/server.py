@@ -1,20 +1,54 @@
-from fastapi import FastAPI, APIRouter, HTTPException, BackgroundTasks, UploadFile, File, Depends
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, APIRouter, HTTPException, UploadFile, File, Depends, Request, Response, Query, BackgroundTasks
+from fastapi.responses import FileResponse, JSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument
 import os
+import asyncio
 import logging
-import shutil
 import jwt
+import json
+import time
+import hashlib
+import base64
+import mimetypes
 from pathlib import Path
 from pydantic import BaseModel, Field, ConfigDict
 from typing import List, Optional
 import uuid
-from datetime import datetime, timezone, timedelta
-
-from email_service import send_contact_notification, send_application_notification
+from datetime import date, datetime, timezone, timedelta
+
+from email_service import close_smtp_pool, get_email_metrics
+from notification_outbox import OutboxWorker, OUTBOX_STATUSES, enqueue_notification, retry_notification
+from cache import TTLCache
+from blog_search import BlogSearchIndex
+from blog_related import compute_neighbour_table, snapshot_terms
+from blog_content import process_content, ensure_processed_posts, is_valid_slug
+from blog_export import export_blog_snapshot
+from rate_limiter import RateLimit, MemoryRateLimiter, MongoRateLimiter, client_ip, retry_after_header
+from db_indexes import ensure_indexes
+from image_variants import (
+    ensure_variant, render_all_variants, delete_variants, is_resizable,
+    pick_width, variants_available, remove_orphan_variants, shutdown_image_executor,
+)
+from file_index import FILE_TYPES, file_document, reconcile_file_index, ensure_file_index
+from file_storage import (
+    UploadTooLarge, store_upload, delete_stored_file, safe_filename, is_stored_name,
+    remove_stale_temp_files, remove_orphan_blobs,
+)
+from admin_accounts import authenticate, ensure_bootstrap_admin, shutdown_password_executor
+from stats_counters import (
+    increment_counters, pending_delta, get_counters,
+    reconcile_counters, ensure_counters,
+)
+from http_cache import (
+    strong_etag, parse_timestamp, latest, validator_headers,
+    is_not_modified, not_modified_response,
+    RangeNotSatisfiable, parse_range, if_range_matches,
+    range_not_satisfiable_response, partial_file_response,
+)
 
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -29,11 +63,88 @@ db = client[os.environ['DB_NAME']]
 # File upload directory
 UPLOAD_DIR = ROOT_DIR / "uploads"
 UPLOAD_DIR.mkdir(exist_ok=True)
+MAX_UPLOAD_MB = int(os.environ.get('MAX_UPLOAD_MB', '25'))
+MAX_UPLOAD_BYTES = MAX_UPLOAD_MB * 1024 * 1024
+# Room for the multipart boundaries and part headers around the file
+MAX_UPLOAD_REQUEST_BYTES = MAX_UPLOAD_BYTES + 64 * 1024
+# Upload names are unique and never rewritten, so public files can be cached forever
+FILE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+FILE_STAT_CACHE_TTL_SECONDS = int(os.environ.get('FILE_STAT_CACHE_TTL_SECONDS', '300'))
+FILE_STAT_CACHE_MAX_ENTRIES = int(os.environ.get('FILE_STAT_CACHE_MAX_ENTRIES', '1024'))
+# filename (or filename@variant) -> (stat_result, etag, last_modified)
+file_stat_cache = TTLCache(maxsize=FILE_STAT_CACHE_MAX_ENTRIES, ttl=FILE_STAT_CACHE_TTL_SECONDS)
 
 # JWT settings
 JWT_SECRET = os.environ.get('JWT_SECRET', 'default-secret-key')
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRATION_HOURS = 24
+JWT_CACHE_MAX_ENTRIES = int(os.environ.get('JWT_CACHE_MAX_ENTRIES', '1024'))
+# Verified tokens, keyed by SHA-256 of the token: digest -> (email, exp).
+# JWT_SECRET is only read at startup, so rotating it means a restart, which
+# also empties this cache.
+jwt_cache = TTLCache(maxsize=JWT_CACHE_MAX_ENTRIES, ttl=JWT_EXPIRATION_HOURS * 3600)
+
+# Blog read cache settings
+BLOG_CACHE_TTL_SECONDS = int(os.environ.get('BLOG_CACHE_TTL_SECONDS', '300'))
+BLOG_CACHE_MAX_ENTRIES = int(os.environ.get('BLOG_CACHE_MAX_ENTRIES', '512'))
+blog_cache = TTLCache(maxsize=BLOG_CACHE_MAX_ENTRIES, ttl=BLOG_CACHE_TTL_SECONDS)
+
+# Blog search index; CMS writes update it directly, the refresh task picks up other workers' writes
+BLOG_SEARCH_REFRESH_SECONDS = float(os.environ.get('BLOG_SEARCH_REFRESH_SECONDS', '60'))
+blog_search = BlogSearchIndex()
+# Related posts: post id -> [(post id, similarity)], recomputed whenever the search index changes
+blog_neighbours: dict = {}
+# Bumped by every rebuild so a slower, older rebuild never replaces a newer table
+blog_neighbours_generation = 0
+blog_search_refresh_task: Optional[asyncio.Task] = None
+# One static snapshot export at a time
+blog_export_lock = asyncio.Lock()
+
+# Notification outbox worker settings
+OUTBOX_CONCURRENCY = int(os.environ.get('OUTBOX_CONCURRENCY', '2'))
+OUTBOX_MAX_ATTEMPTS = int(os.environ.get('OUTBOX_MAX_ATTEMPTS', '6'))
+OUTBOX_BACKOFF_BASE_SECONDS = float(os.environ.get('OUTBOX_BACKOFF_BASE_SECONDS', '30'))
+OUTBOX_BACKOFF_MAX_SECONDS = float(os.environ.get('OUTBOX_BACKOFF_MAX_SECONDS', '3600'))
+OUTBOX_POLL_SECONDS = float(os.environ.get('OUTBOX_POLL_SECONDS', '10'))
+# Sent notifications are deleted this long after sending
+OUTBOX_SENT_RETENTION_DAYS = float(os.environ.get('OUTBOX_SENT_RETENTION_DAYS', '7'))
+# Digest mode: 0 sends every notification on its own
+NOTIFICATION_DIGEST_WINDOW_SECONDS = float(os.environ.get('NOTIFICATION_DIGEST_WINDOW_SECONDS', '0'))
+NOTIFICATION_DIGEST_MAX_ITEMS = int(os.environ.get('NOTIFICATION_DIGEST_MAX_ITEMS', '20'))
+# Notification kinds that are always sent immediately, even in digest mode
+NOTIFICATION_IMMEDIATE_KINDS = {
+    kind.strip() for kind in os.environ.get('NOTIFICATION_IMMEDIATE_KINDS', 'application').split(',') if kind.strip()
+}
+outbox_worker: Optional[OutboxWorker] = None
+
+# Rate limiting for public form and login endpoints
+RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() != 'false'
+# "memory" keeps buckets per process; "mongo" shares them between workers
+RATE_LIMIT_BACKEND = os.environ.get('RATE_LIMIT_BACKEND', 'memory')
+# Number of proxies in front of the app that append to X-Forwarded-For; the
+# client IP is read from the entry the outermost one added. With 0 (the
+# default) limits key on the socket peer, so behind a proxy such as Railway's
+# every visitor shares the proxy's bucket. RATE_LIMIT_TRUST_PROXY=true is
+# the older spelling of 1.
+RATE_LIMIT_TRUSTED_PROXIES = int(os.environ.get(
+    'RATE_LIMIT_TRUSTED_PROXIES',
+    '1' if os.environ.get('RATE_LIMIT_TRUST_PROXY', 'false').lower() == 'true' else '0',
+))
+RATE_LIMITS = {
+    "contact": RateLimit(
+        per_minute=float(os.environ.get('RATE_LIMIT_FORMS_PER_MINUTE', '10')),
+        burst=int(os.environ.get('RATE_LIMIT_FORMS_BURST', '20')),
+    ),
+    "application": RateLimit(
+        per_minute=float(os.environ.get('RATE_LIMIT_FORMS_PER_MINUTE', '10')),
+        burst=int(os.environ.get('RATE_LIMIT_FORMS_BURST', '20')),
+    ),
+    "admin_login": RateLimit(
+        per_minute=float(os.environ.get('RATE_LIMIT_LOGIN_PER_MINUTE', '10')),
+        burst=int(os.environ.get('RATE_LIMIT_LOGIN_BURST', '20')),
+    ),
+}
+rate_limiter = MongoRateLimiter(db.rate_limits) if RATE_LIMIT_BACKEND == 'mongo' else MemoryRateLimiter()
 
 # Create the main app without a prefix
 app = FastAPI()
@@ -129,9 +240,13 @@ class BlogPostCreate(BaseModel):
     author: str = "Rushabh Ventures Team"
     category: str
     image: str
-    read_time: str = "5 min read"
     faqs: Optional[List[FAQItem]] = None
 
+class TocEntry(BaseModel):
+    id: str
+    title: str
+    level: int
+
 class BlogPostResponse(BaseModel):
     model_config = ConfigDict(extra="ignore")
     
@@ -146,6 +261,42 @@ class BlogPostResponse(BaseModel):
     category: str
     image: str
     faqs: Optional[List[FAQItem]] = None
+    word_count: Optional[int] = None
+    toc: List[TocEntry] = []
+
+class BlogPostSummary(BaseModel):
+    """Blog listing card - everything except the post body and FAQs"""
+    model_config = ConfigDict(extra="ignore")
+    
+    id: str
+    slug: str
+    title: str
+    excerpt: str
+    author: str
+    date: str
+    read_time: str
+    category: str
+    image: str
+
+class BlogPostSummaryPage(BaseModel):
+    items: List[BlogPostSummary]
+    next_cursor: Optional[str] = None
+
+class BlogCategory(BaseModel):
+    name: str
+    count: int
+
+class BlogPostDetailResponse(BlogPostResponse):
+    related: List[BlogPostSummary] = []
+
+class BlogSearchHit(BlogPostSummary):
+    score: float
+    snippet: str
+
+class BlogSearchResponse(BaseModel):
+    query: str
+    total: int
+    results: List[BlogSearchHit]
 
 
 # Admin Models
@@ -165,6 +316,8 @@ class FileInfo(BaseModel):
     type: str
     url: str
     created_at: str
+    sha256: Optional[str] = None
+    uploader: Optional[str] = None
 
 
 # ============ AUTH HELPERS ============
@@ -179,16 +332,227 @@ def create_jwt_token(email: str) -> str:
     }
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
-def verify_jwt_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
+async def verify_jwt_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
     """Verify JWT token and return email"""
+    token = credentials.credentials
+    cache_key = hashlib.sha256(token.encode()).digest()
+    
+    # Already verified: only the expiry needs checking
+    cached = jwt_cache.get(cache_key)
+    if cached is not None:
+        email, exp = cached
+        if exp > time.time():
+            return email
+        jwt_cache.delete(cache_key)
+        raise HTTPException(status_code=401, detail="Token has expired")
+    
     try:
-        token = credentials.credentials
         payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        return payload["email"]
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token has expired")
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
+    
+    email = payload["email"]
+    exp = payload.get("exp")
+    if exp is not None:
+        jwt_cache.set(cache_key, (email, exp), ttl=max(0, exp - time.time()))
+    return email
+
+
+# ============ RATE LIMITING ============
+
+def rate_limited(route: str):
+    """Dependency rejecting requests over the route's per-client budget with 429"""
+    limit = RATE_LIMITS[route]
+    
+    async def check(request: Request):
+        if not RATE_LIMIT_ENABLED:
+            return
+        key = f"{route}:{client_ip(request, RATE_LIMIT_TRUSTED_PROXIES)}"
+        try:
+            retry_after = await rate_limiter.hit(key, limit)
+        except Exception as e:
+            # Fail open: a limiter outage should not take the forms down
+            logger.error(f"Rate limiter error for {key}: {str(e)}")
+            return
+        if retry_after > 0:
+            raise HTTPException(
+                status_code=429,
+                detail="Too many requests, please try again later",
+                headers={"Retry-After": retry_after_header(retry_after)},
+            )
+    
+    return check
+
+
+# ============ CACHE HELPERS ============
+
+BLOG_LIST_CACHE_KEY = "blog:list"
+BLOG_INDEX_CACHE_PREFIX = "blog:index:"
+BLOG_CATEGORIES_CACHE_KEY = "blog:categories"
+
+def blog_post_cache_key(slug: str) -> str:
+    """Cache key for a single blog post"""
+    return f"blog:post:{slug}"
+
+async def refresh_related_posts():
+    """Recompute the related-posts neighbour table from the search index"""
+    global blog_neighbours, blog_neighbours_generation
+    blog_neighbours_generation += 1
+    generation = blog_neighbours_generation
+    # Copy the terms on the event loop, where the index is written, then build off it
+    doc_ids, postings = snapshot_terms(blog_search)
+    table = await asyncio.to_thread(compute_neighbour_table, doc_ids, postings)
+    if generation == blog_neighbours_generation:
+        blog_neighbours = table
+
+def related_posts(post_id: str) -> List[dict]:
+    """Listing cards of the posts most similar to post_id"""
+    summaries = (blog_search.summary(related_id) for related_id, _ in blog_neighbours.get(post_id, []))
+    return [summary for summary in summaries if summary is not None]
+
+def invalidate_blog_cache(*slugs: str):
+    """Drop the cached blog lists, categories and the given post slugs after a CMS write"""
+    blog_cache.delete(BLOG_CATEGORIES_CACHE_KEY, *[blog_post_cache_key(slug) for slug in slugs])
+    # Covers the unfiltered list and the per-category lists
+    blog_cache.delete_prefix(BLOG_LIST_CACHE_KEY)
+    blog_cache.delete_prefix(BLOG_INDEX_CACHE_PREFIX)
+
+
+# ============ PAGINATION HELPERS ============
+
+def encode_cursor(*values) -> str:
+    """Encode keyset pagination values into an opaque URL-safe cursor"""
+    return base64.urlsafe_b64encode(json.dumps(list(values)).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """Decode a cursor produced by encode_cursor, raising 400 if it is malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != size or not all(isinstance(v, str) for v in values):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+def parse_date_filter(value: Optional[str], field: str) -> Optional[str]:
+    """Normalise a date/datetime query parameter to the UTC ISO format stored on documents"""
+    if value is None:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {field}, expected an ISO date or datetime")
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat()
+
+async def paginate_newest_first(collection, response: Response, query: dict, limit: int, after: Optional[str]) -> list:
+    """
+    Keyset-paginate documents matching query newest first on (created_at, id).
+    The next page cursor and the total number of matching documents are
+    returned in the X-Next-Cursor and X-Total-Count headers.
+    """
+    # Without filters the collection metadata count avoids scanning anything
+    if query:
+        total = await collection.count_documents(query)
+    else:
+        total = await collection.estimated_document_count()
+    
+    if after:
+        after_created_at, after_id = decode_cursor(after, 2)
+        keyset = {"$or": [
+            {"created_at": {"$lt": after_created_at}},
+            {"created_at": after_created_at, "id": {"$lt": after_id}},
+        ]}
+        query = {"$and": [query, keyset]} if query else keyset
+    
+    # Fetch one extra document to learn whether another page exists
+    docs = await collection.find(query, {"_id": 0}) \
+        .sort([("created_at", -1), ("id", -1)]).limit(limit + 1).to_list(limit + 1)
+    if len(docs) > limit:
+        docs = docs[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(docs[-1]["created_at"], docs[-1]["id"])
+    response.headers["X-Total-Count"] = str(total)
+    return docs
+
+async def paginate_leads(
+    collection,
+    response: Response,
+    limit: int,
+    after: Optional[str],
+    status: Optional[str],
+    date_from: Optional[str],
+    date_to: Optional[str],
+) -> list:
+    """Filter a lead collection (contacts/applications) and return one page, newest first"""
+    query = {}
+    if status:
+        query["status"] = status
+    created_at = {}
+    if date_from:
+        created_at["$gte"] = parse_date_filter(date_from, "date_from")
+    if date_to:
+        try:
+            day = date.fromisoformat(date_to)
+        except ValueError:
+            created_at["$lte"] = parse_date_filter(date_to, "date_to")
+        else:
+            # A bare date covers that whole day, up to the start of the next one
+            created_at["$lt"] = parse_date_filter((day + timedelta(days=1)).isoformat(), "date_to")
+    if created_at:
+        query["created_at"] = created_at
+    
+    return await paginate_newest_first(collection, response, query, limit, after)
+
+
+# ============ OUTBOX HELPERS ============
+
+def notification_priority(kind: str) -> str:
+    """High-priority notifications skip digest mode and are sent right away"""
+    return "high" if kind in NOTIFICATION_IMMEDIATE_KINDS else "normal"
+
+def wake_outbox_worker():
+    """Let the outbox worker pick up a freshly queued notification right away"""
+    if outbox_worker is not None:
+        outbox_worker.notify()
+
+
+# ============ CONDITIONAL GET HELPERS ============
+
+# Public blog responses may be stored by browsers and CDNs but must be revalidated
+BLOG_CACHE_CONTROL = "public, no-cache"
+
+def blog_post_validators(post: dict):
+    """ETag and Last-Modified for a blog post, driven by its CMS version counter"""
+    etag = strong_etag(post["id"], post.get("version", 0))
+    last_modified = parse_timestamp(post.get("updated_at") or post.get("date"))
+    return etag, last_modified
+
+# Only the fields needed for listing cards (plus the ETag inputs)
+BLOG_SUMMARY_PROJECTION = {
+    "_id": 0, "id": 1, "slug": 1, "title": 1, "excerpt": 1, "author": 1, "date": 1,
+    "read_time": 1, "category": 1, "image": 1, "version": 1, "updated_at": 1,
+}
+# Full posts minus the plain text kept for the search index and the submitted HTML
+BLOG_POST_PROJECTION = {"_id": 0, "text": 0, "content_source": 0}
+
+# Paths under /api/blog/ that are routes rather than post slugs
+RESERVED_BLOG_SLUGS = {"index", "search", "categories"}
+def validate_blog_slug(slug: str):
+    """Reject slugs that are reserved or not lowercase words joined by hyphens"""
+    if slug in RESERVED_BLOG_SLUGS:
+        raise HTTPException(status_code=400, detail="This slug is reserved")
+    if not is_valid_slug(slug):
+        raise HTTPException(status_code=400, detail="Slug may only contain lowercase letters, numbers and hyphens")
+
+def blog_list_validators(posts: list):
+    """ETag and Last-Modified for a list of blog posts"""
+    etag = strong_etag(*[f"{post['id']}:{post.get('version', 0)}" for post in posts])
+    last_modified = latest(blog_post_validators(post)[1] for post in posts)
+    return etag, last_modified
 
 
 # ============ PUBLIC ROUTES ============
@@ -220,8 +584,8 @@ async def get_status_checks():
 
 
 # Contact Form Endpoints
-@api_router.post("/contact", response_model=ContactResponse)
-async def submit_contact(contact: ContactCreate, background_tasks: BackgroundTasks):
+@api_router.post("/contact", response_model=ContactResponse, dependencies=[Depends(rate_limited("contact"))])
+async def submit_contact(contact: ContactCreate):
     """Submit a contact form and send email notification"""
     contact_id = str(uuid.uuid4())
     created_at = datetime.now(timezone.utc).isoformat()
@@ -240,16 +604,18 @@ async def submit_contact(contact: ContactCreate, background_tasks: BackgroundTas
     }
     
     await db.contacts.insert_one(contact_doc)
+    await increment_counters(db, contacts_total=1, contacts_pending=1)
     
-    # Send email notification in background
-    background_tasks.add_task(send_contact_notification, contact_doc)
+    # Queue email notification for the outbox worker
+    await enqueue_notification(db, "contact", contact_doc, notification_priority("contact"))
+    wake_outbox_worker()
     
     return ContactResponse(**{k: v for k, v in contact_doc.items() if k != '_id'})
 
 
 # Application Form Endpoints
-@api_router.post("/application", response_model=ApplicationResponse)
-async def submit_application(application: ApplicationCreate, background_tasks: BackgroundTasks):
+@api_router.post("/application", response_model=ApplicationResponse, dependencies=[Depends(rate_limited("application"))])
+async def submit_application(application: ApplicationCreate):
     """Submit an IPO application and send email notification"""
     app_id = str(uuid.uuid4())
     created_at = datetime.now(timezone.utc).isoformat()
@@ -266,47 +632,156 @@ async def submit_application(application: ApplicationCreate, background_tasks: B
     }
     
     await db.applications.insert_one(app_doc)
+    await increment_counters(db, applications_total=1, applications_pending=1)
     
-    # Send email notification in background
-    background_tasks.add_task(send_application_notification, app_doc)
+    # Queue email notification for the outbox worker
+    await enqueue_notification(db, "application", app_doc, notification_priority("application"))
+    wake_outbox_worker()
     
     return ApplicationResponse(**{k: v for k, v in app_doc.items() if k != '_id'})
 
 
 # Blog Public Endpoints
 @api_router.get("/blog", response_model=List[BlogPostResponse])
-async def get_blog_posts():
-    """Get all blog posts"""
-    posts = await db.blog_posts.find({}, {"_id": 0}).to_list(100)
+async def get_blog_posts(request: Request, response: Response, category: Optional[str] = None):
+    """Get all blog posts, optionally only those in one category"""
+    cache_key = f"{BLOG_LIST_CACHE_KEY}:category:{category}" if category else BLOG_LIST_CACHE_KEY
+    cached = blog_cache.get(cache_key)
+    if cached is None:
+        query = {"category": category} if category else {}
+        posts = await db.blog_posts.find(query, BLOG_POST_PROJECTION).to_list(100)
+        cached = (posts, *blog_list_validators(posts))
+        blog_cache.set(cache_key, cached)
+        # The list already holds full documents, so warm the per-slug entries too
+        for post in posts:
+            blog_cache.set(blog_post_cache_key(post["slug"]), post)
+    
+    posts, etag, last_modified = cached
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    
+    response.headers.update(validator_headers(etag, last_modified))
+    response.headers["Cache-Control"] = BLOG_CACHE_CONTROL
     return posts
 
 
-@api_router.get("/blog/{slug}", response_model=BlogPostResponse)
-async def get_blog_post(slug: str):
-    """Get a single blog post by slug"""
-    post = await db.blog_posts.find_one({"slug": slug}, {"_id": 0})
-    if not post:
-        raise HTTPException(status_code=404, detail="Blog post not found")
-    return post
+@api_router.get("/blog/index", response_model=BlogPostSummaryPage)
+async def get_blog_index(
+    request: Request,
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    category: Optional[str] = None,
+):
+    """Get a page of blog post summaries (newest first) without post bodies"""
+    cache_key = f"{BLOG_INDEX_CACHE_PREFIX}{limit}:{cursor or ''}:{category or ''}"
+    cached = blog_cache.get(cache_key)
+    if cached is None:
+        query = {"category": category} if category else {}
+        if cursor:
+            after_date, after_id = decode_cursor(cursor, 2)
+            query["$or"] = [
+                {"date": {"$lt": after_date}},
+                {"date": after_date, "id": {"$lt": after_id}},
+            ]
+        
+        # Fetch one extra document to learn whether another page exists
+        posts = await db.blog_posts.find(query, BLOG_SUMMARY_PROJECTION) \
+            .sort([("date", -1), ("id", -1)]).limit(limit + 1).to_list(limit + 1)
+        next_cursor = None
+        if len(posts) > limit:
+            posts = posts[:limit]
+            next_cursor = encode_cursor(posts[-1]["date"], posts[-1]["id"])
+        
+        list_etag, last_modified = blog_list_validators(posts)
+        cached = (posts, next_cursor, strong_etag(list_etag, next_cursor), last_modified)
+        blog_cache.set(cache_key, cached)
+    
+    posts, next_cursor, etag, last_modified = cached
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    
+    response.headers.update(validator_headers(etag, last_modified))
+    response.headers["Cache-Control"] = BLOG_CACHE_CONTROL
+    return {"items": posts, "next_cursor": next_cursor}
+
+
+@api_router.get("/blog/categories", response_model=List[BlogCategory])
+async def get_blog_categories(request: Request, response: Response):
+    """Get blog categories with their post counts, largest first"""
+    cached = blog_cache.get(BLOG_CATEGORIES_CACHE_KEY)
+    if cached is None:
+        # Sorting on the indexed field first lets the group read the index only
+        pipeline = [
+            {"$match": {"category": {"$nin": [None, ""]}}},
+            {"$sort": {"category": 1}},
+            {"$group": {"_id": "$category", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1, "_id": 1}},
+        ]
+        groups = await db.blog_posts.aggregate(pipeline).to_list(None)
+        categories = [{"name": group["_id"], "count": group["count"]} for group in groups]
+        cached = (categories, strong_etag(*[f"{c['name']}:{c['count']}" for c in categories]))
+        blog_cache.set(BLOG_CATEGORIES_CACHE_KEY, cached)
+    
+    categories, etag = cached
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    
+    response.headers.update(validator_headers(etag))
+    response.headers["Cache-Control"] = BLOG_CACHE_CONTROL
+    return categories
+
+
+@api_router.get("/blog/search", response_model=BlogSearchResponse)
+async def search_blog_posts(
+    q: str = Query(..., min_length=1, max_length=200),
+    category: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=50),
+):
+    """Full-text search over blog posts, best matches first"""
+    result = blog_search.search(q, category=category, limit=limit)
+    return {"query": q, **result}
+
+
+@api_router.get("/blog/{slug}", response_model=BlogPostDetailResponse)
+async def get_blog_post(slug: str, request: Request, response: Response):
+    """Get a single blog post by slug, with related posts"""
+    cache_key = blog_post_cache_key(slug)
+    post = blog_cache.get(cache_key)
+    if post is None:
+        post = await db.blog_posts.find_one({"slug": slug}, BLOG_POST_PROJECTION)
+        if not post:
+            raise HTTPException(status_code=404, detail="Blog post not found")
+        blog_cache.set(cache_key, post)
+    
+    related = related_posts(post["id"])
+    etag, last_modified = blog_post_validators(post)
+    # Related posts change when other posts do, so they are part of the ETag
+    etag = strong_etag(etag, *[summary["id"] for summary in related])
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    
+    response.headers.update(validator_headers(etag, last_modified))
+    response.headers["Cache-Control"] = BLOG_CACHE_CONTROL
+    return {**post, "related": related}
 
 
 # ============ ADMIN AUTH ============
 
-@api_router.post("/admin/login", response_model=AdminLoginResponse)
+@api_router.post("/admin/login", response_model=AdminLoginResponse, dependencies=[Depends(rate_limited("admin_login"))])
 async def admin_login(credentials: AdminLogin):
     """Admin login endpoint"""
-    admin_email = os.environ.get('ADMIN_EMAIL')
-    admin_password = os.environ.get('ADMIN_PASSWORD')
-    
-    if credentials.email != admin_email or credentials.password != admin_password:
+    # The stored address, so every login identifies the admin the same way whatever its casing
+    admin_email = await authenticate(db, credentials.email, credentials.password)
+    if admin_email is None:
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
-    token = create_jwt_token(credentials.email)
+    token = create_jwt_token(admin_email)
     expiration = datetime.now(timezone.utc) + timedelta(hours=JWT_EXPIRATION_HOURS)
     
     return AdminLoginResponse(
         token=token,
-        email=credentials.email,
+        email=admin_email,
         expires_at=expiration.isoformat()
     )
 
@@ -319,10 +794,17 @@ async def verify_admin(email: str = Depends(verify_jwt_token)):
 # ============ ADMIN CONTACTS ============
 
 @api_router.get("/admin/contacts", response_model=List[ContactResponse])
-async def admin_get_contacts(email: str = Depends(verify_jwt_token)):
-    """Get all contacts (admin only)"""
-    contacts = await db.contacts.find({}, {"_id": 0}).sort("created_at", -1).to_list(1000)
-    return contacts
+async def admin_get_contacts(
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    after: Optional[str] = None,
+    status: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    email: str = Depends(verify_jwt_token),
+):
+    """Get a page of contacts, newest first (admin only)"""
+    return await paginate_leads(db.contacts, response, limit, after, status, date_from, date_to)
 
 @api_router.put("/admin/contacts/{contact_id}")
 async def admin_update_contact(contact_id: str, update: ContactUpdate, email: str = Depends(verify_jwt_token)):
@@ -331,29 +813,40 @@ async def admin_update_contact(contact_id: str, update: ContactUpdate, email: st
     if not update_data:
         raise HTTPException(status_code=400, detail="No update data provided")
     
-    result = await db.contacts.update_one({"id": contact_id}, {"$set": update_data})
-    if result.matched_count == 0:
+    previous = await db.contacts.find_one_and_update(
+        {"id": contact_id}, {"$set": update_data}, projection={"_id": 0},
+        return_document=ReturnDocument.BEFORE
+    )
+    if previous is None:
         raise HTTPException(status_code=404, detail="Contact not found")
     
-    updated = await db.contacts.find_one({"id": contact_id}, {"_id": 0})
-    return updated
+    await increment_counters(db, contacts_pending=pending_delta(previous.get("status"), update_data.get("status", previous.get("status"))))
+    return {**previous, **update_data}
 
 @api_router.delete("/admin/contacts/{contact_id}")
 async def admin_delete_contact(contact_id: str, email: str = Depends(verify_jwt_token)):
     """Delete a contact (admin only)"""
-    result = await db.contacts.delete_one({"id": contact_id})
-    if result.deleted_count == 0:
+    deleted = await db.contacts.find_one_and_delete({"id": contact_id}, projection={"status": 1})
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Contact not found")
+    await increment_counters(db, contacts_total=-1, contacts_pending=pending_delta(deleted.get("status"), None))
     return {"message": "Contact deleted successfully"}
 
 
 # ============ ADMIN APPLICATIONS ============
 
 @api_router.get("/admin/applications", response_model=List[ApplicationResponse])
-async def admin_get_applications(email: str = Depends(verify_jwt_token)):
-    """Get all applications (admin only)"""
-    applications = await db.applications.find({}, {"_id": 0}).sort("created_at", -1).to_list(1000)
-    return applications
+async def admin_get_applications(
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    after: Optional[str] = None,
+    status: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    email: str = Depends(verify_jwt_token),
+):
+    """Get a page of applications, newest first (admin only)"""
+    return await paginate_leads(db.applications, response, limit, after, status, date_from, date_to)
 
 @api_router.put("/admin/applications/{app_id}")
 async def admin_update_application(app_id: str, update: ApplicationUpdate, email: str = Depends(verify_jwt_token)):
@@ -362,19 +855,23 @@ async def admin_update_application(app_id: str, update: ApplicationUpdate, email
     if not update_data:
         raise HTTPException(status_code=400, detail="No update data provided")
     
-    result = await db.applications.update_one({"id": app_id}, {"$set": update_data})
-    if result.matched_count == 0:
+    previous = await db.applications.find_one_and_update(
+        {"id": app_id}, {"$set": update_data}, projection={"_id": 0},
+        return_document=ReturnDocument.BEFORE
+    )
+    if previous is None:
         raise HTTPException(status_code=404, detail="Application not found")
     
-    updated = await db.applications.find_one({"id": app_id}, {"_id": 0})
-    return updated
+    await increment_counters(db, applications_pending=pending_delta(previous.get("status"), update_data.get("status", previous.get("status"))))
+    return {**previous, **update_data}
 
 @api_router.delete("/admin/applications/{app_id}")
 async def admin_delete_application(app_id: str, email: str = Depends(verify_jwt_token)):
     """Delete an application (admin only)"""
-    result = await db.applications.delete_one({"id": app_id})
-    if result.deleted_count == 0:
+    deleted = await db.applications.find_one_and_delete({"id": app_id}, projection={"status": 1})
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Application not found")
+    await increment_counters(db, applications_total=-1, applications_pending=pending_delta(deleted.get("status"), None))
     return {"message": "Application deleted successfully"}
 
 
@@ -383,19 +880,25 @@ async def admin_delete_application(app_id: str, email: str = Depends(verify_jwt_
 @api_router.get("/admin/blog", response_model=List[BlogPostResponse])
 async def admin_get_blog_posts(email: str = Depends(verify_jwt_token)):
     """Get all blog posts (admin only)"""
-    posts = await db.blog_posts.find({}, {"_id": 0}).sort("date", -1).to_list(100)
+    posts = await db.blog_posts.find({}, {"_id": 0, "text": 0}).sort("date", -1).to_list(100)
+    for post in posts:
+        # The editor works on the HTML as submitted, not the sanitized copy
+        post["content"] = post.pop("content_source", post.get("content"))
     return posts
 
 @api_router.post("/admin/blog", response_model=BlogPostResponse)
 async def admin_create_blog_post(post: BlogPostCreate, email: str = Depends(verify_jwt_token)):
     """Create a new blog post (admin only)"""
+    validate_blog_slug(post.slug)
+    
     # Check if slug already exists
     existing = await db.blog_posts.find_one({"slug": post.slug})
     if existing:
         raise HTTPException(status_code=400, detail="A post with this slug already exists")
     
     post_id = str(uuid.uuid4())
-    date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    now = datetime.now(timezone.utc)
+    date = now.strftime("%Y-%m-%d")
     
     # Convert FAQs to dict format
     faqs_data = None
@@ -407,16 +910,22 @@ async def admin_create_blog_post(post: BlogPostCreate, email: str = Depends(veri
         "slug": post.slug,
         "title": post.title,
         "excerpt": post.excerpt,
-        "content": post.content,
         "author": post.author,
         "date": date,
-        "read_time": post.read_time,
         "category": post.category,
         "image": post.image,
-        "faqs": faqs_data
+        "faqs": faqs_data,
+        "version": 1,
+        "updated_at": now.isoformat(),
+        # Sanitized content, read time, table of contents and search text
+        **process_content(post.content)
     }
     
     await db.blog_posts.insert_one(post_doc)
+    await increment_counters(db, blog_posts=1)
+    invalidate_blog_cache(post.slug)
+    blog_search.upsert(post_doc)
+    await refresh_related_posts()
     
     return BlogPostResponse(**{k: v for k, v in post_doc.items() if k != '_id'})
 
@@ -435,120 +944,241 @@ async def admin_update_blog_post(slug: str, post: BlogPostCreate, email: str = D
     update_data = {
         "title": post.title,
         "excerpt": post.excerpt,
-        "content": post.content,
         "author": post.author,
-        "read_time": post.read_time,
         "category": post.category,
         "image": post.image,
-        "faqs": faqs_data
+        "faqs": faqs_data,
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+        **process_content(post.content)
     }
     
     # If slug is changing, check the new slug doesn't exist
     if post.slug != slug:
+        validate_blog_slug(post.slug)
         slug_exists = await db.blog_posts.find_one({"slug": post.slug})
         if slug_exists:
             raise HTTPException(status_code=400, detail="A post with this slug already exists")
         update_data["slug"] = post.slug
     
-    await db.blog_posts.update_one({"slug": slug}, {"$set": update_data})
+    # Bump the version so public ETags change with every CMS write
+    await db.blog_posts.update_one({"slug": slug}, {"$set": update_data, "$inc": {"version": 1}})
+    invalidate_blog_cache(slug, post.slug)
     
     updated = await db.blog_posts.find_one({"slug": post.slug if post.slug != slug else slug}, {"_id": 0})
+    blog_search.upsert(updated)
+    await refresh_related_posts()
     return BlogPostResponse(**updated)
 
 @api_router.delete("/admin/blog/{slug}")
 async def admin_delete_blog_post(slug: str, email: str = Depends(verify_jwt_token)):
     """Delete a blog post (admin only)"""
-    result = await db.blog_posts.delete_one({"slug": slug})
-    if result.deleted_count == 0:
+    deleted = await db.blog_posts.find_one_and_delete({"slug": slug}, projection={"_id": 0, "id": 1})
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Blog post not found")
+    await increment_counters(db, blog_posts=-1)
+    invalidate_blog_cache(slug)
+    blog_search.remove(deleted["id"])
+    await refresh_related_posts()
     return {"message": "Blog post deleted successfully"}
 
+@api_router.post("/admin/blog/export")
+async def admin_export_blog(email: str = Depends(verify_jwt_token)):
+    """Update the static snapshot of the public blog (admin only)"""
+    async with blog_export_lock:
+        return await export_blog_snapshot(db, neighbours=blog_neighbours)
+
 
 # ============ ADMIN FILE MANAGER ============
 
-def get_file_type(filename: str) -> str:
-    """Get file type based on extension"""
-    ext = filename.lower().split('.')[-1] if '.' in filename else ''
-    image_exts = ['jpg', 'jpeg', 'png', 'gif', 'webp', 'svg', 'ico']
-    doc_exts = ['pdf', 'doc', 'docx', 'xls', 'xlsx', 'ppt', 'pptx', 'txt']
-    
-    if ext in image_exts:
-        return 'image'
-    elif ext in doc_exts:
-        return 'document'
-    else:
-        return 'other'
+def file_info(doc: dict) -> FileInfo:
+    """FileInfo for a files collection document"""
+    return FileInfo(
+        name=doc["name"],
+        path=str((UPLOAD_DIR / doc["name"]).relative_to(ROOT_DIR)),
+        size=doc["size"],
+        type=doc["type"],
+        url=f"/api/files/{doc['name']}",
+        created_at=doc["created_at"],
+        sha256=doc.get("sha256"),
+        uploader=doc.get("uploader")
+    )
 
 @api_router.get("/admin/files", response_model=List[FileInfo])
-async def admin_list_files(email: str = Depends(verify_jwt_token)):
-    """List all uploaded files (admin only)"""
-    files = []
-    
-    if UPLOAD_DIR.exists():
-        for file_path in UPLOAD_DIR.iterdir():
-            if file_path.is_file():
-                stat = file_path.stat()
-                files.append(FileInfo(
-                    name=file_path.name,
-                    path=str(file_path.relative_to(ROOT_DIR)),
-                    size=stat.st_size,
-                    type=get_file_type(file_path.name),
-                    url=f"/api/files/{file_path.name}",
-                    created_at=datetime.fromtimestamp(stat.st_ctime, timezone.utc).isoformat()
-                ))
-    
-    # Sort by created_at descending
-    files.sort(key=lambda x: x.created_at, reverse=True)
-    return files
+async def admin_list_files(
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    after: Optional[str] = None,
+    type: Optional[str] = None,
+    email: str = Depends(verify_jwt_token),
+):
+    """Get a page of uploaded files, newest first (admin only)"""
+    if type is not None and type not in FILE_TYPES:
+        raise HTTPException(status_code=400, detail=f"Invalid type, expected one of: {', '.join(FILE_TYPES)}")
+    query = {"type": type} if type else {}
+    docs = await paginate_newest_first(db.files, response, query, limit, after)
+    return [file_info(doc) for doc in docs]
 
 @api_router.post("/admin/files/upload")
-async def admin_upload_file(file: UploadFile = File(...), email: str = Depends(verify_jwt_token)):
+async def admin_upload_file(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    email: str = Depends(verify_jwt_token),
+):
     """Upload a file (admin only)"""
+    if file.size is not None and file.size > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail=f"File exceeds the {MAX_UPLOAD_MB} MB upload limit")
+    
     # Generate unique filename to avoid conflicts
-    ext = file.filename.split('.')[-1] if '.' in file.filename else ''
-    unique_name = f"{uuid.uuid4().hex[:8]}_{file.filename}"
+    unique_name = f"{uuid.uuid4().hex[:8]}_{safe_filename(file.filename or '')}"
     file_path = UPLOAD_DIR / unique_name
     
     try:
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        stat = file_path.stat()
-        return FileInfo(
-            name=unique_name,
-            path=str(file_path.relative_to(ROOT_DIR)),
-            size=stat.st_size,
-            type=get_file_type(unique_name),
-            url=f"/api/files/{unique_name}",
-            created_at=datetime.now(timezone.utc).isoformat()
-        )
+        stored = await store_upload(file.file, file_path, MAX_UPLOAD_BYTES)
+    except UploadTooLarge:
+        raise HTTPException(status_code=413, detail=f"File exceeds the {MAX_UPLOAD_MB} MB upload limit")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to upload file: {str(e)}")
+    
+    doc = file_document(unique_name, stored.size, stored.sha256, uploader=email, content_type=file.content_type)
+    await db.files.insert_one(doc)
+    await increment_counters(db, files=1)
+    if variants_available() and is_resizable(unique_name):
+        background_tasks.add_task(render_all_variants, UPLOAD_DIR, unique_name)
+    return file_info(doc)
 
 @api_router.delete("/admin/files/{filename}")
 async def admin_delete_file(filename: str, email: str = Depends(verify_jwt_token)):
     """Delete a file (admin only)"""
+    # Temp files, blobs, variants and anything outside the upload directory
+    # are not files the admin can address
+    if not is_stored_name(UPLOAD_DIR, filename):
+        raise HTTPException(status_code=404, detail="File not found")
     file_path = UPLOAD_DIR / filename
     
-    if not file_path.exists():
+    doc = await db.files.find_one_and_delete({"name": filename}, projection={"_id": 0})
+    file_stat_cache.delete_prefix(filename)
+    if doc is None and not file_path.exists():
         raise HTTPException(status_code=404, detail="File not found")
     
     try:
-        file_path.unlink()
-        return {"message": "File deleted successfully"}
+        await asyncio.to_thread(delete_variants, UPLOAD_DIR, filename)
+        await delete_stored_file(file_path, doc.get("sha256") if doc else None)
+    except FileNotFoundError:
+        pass
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to delete file: {str(e)}")
+    
+    if doc is not None:
+        await increment_counters(db, files=-1)
+    return {"message": "File deleted successfully"}
+
+@api_router.post("/admin/files/reconcile")
+async def admin_reconcile_files(email: str = Depends(verify_jwt_token)):
+    """Sync the file index with the upload directory (admin only)"""
+    result = await reconcile_file_index(db, UPLOAD_DIR)
+    await reconcile_counters(db)
+    return result
+
+def file_validators(cache_key: str, file_path: Path) -> tuple:
+    """(stat_result, etag, last_modified) for a served file, via the stat cache"""
+    cached = file_stat_cache.get(cache_key)
+    if cached is None:
+        try:
+            stat = file_path.stat()
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="File not found")
+        etag = strong_etag(cache_key, stat.st_size, stat.st_mtime_ns)
+        last_modified = datetime.fromtimestamp(stat.st_mtime, timezone.utc)
+        cached = (stat, etag, last_modified)
+        file_stat_cache.set(cache_key, cached)
+    return cached
 
 # Public file serving
 @api_router.get("/files/{filename}")
-async def get_file(filename: str):
-    """Serve uploaded files (public)"""
+async def get_file(filename: str, request: Request, w: Optional[int] = Query(None, ge=1)):
+    """Serve uploaded files (public); ?w= serves a resized copy of an image"""
+    if not is_stored_name(UPLOAD_DIR, filename):
+        raise HTTPException(status_code=404, detail="File not found")
     file_path = UPLOAD_DIR / filename
     
-    if not file_path.exists():
-        raise HTTPException(status_code=404, detail="File not found")
+    stat, etag, last_modified = file_validators(filename, file_path)
+    
+    if w is not None and is_resizable(filename):
+        # WebP when the browser accepts it; caches must key on Accept
+        webp = "image/webp" in request.headers.get("accept", "")
+        variant = await ensure_variant(UPLOAD_DIR, filename, pick_width(w), webp)
+        if variant is not None:
+            stat, etag, last_modified = file_validators(f"{filename}@{variant.name}", variant)
+            headers = {
+                **validator_headers(etag, last_modified),
+                "Cache-Control": FILE_CACHE_CONTROL,
+                "Vary": "Accept",
+            }
+            if is_not_modified(request, etag, last_modified):
+                return Response(status_code=304, headers=headers)
+            return FileResponse(variant, stat_result=stat, headers=headers)
+    
+    headers = {
+        **validator_headers(etag, last_modified),
+        "Cache-Control": FILE_CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+    }
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    
+    range_header = request.headers.get("range")
+    if range_header and if_range_matches(request, etag, last_modified):
+        try:
+            byte_range = parse_range(range_header, stat.st_size)
+        except RangeNotSatisfiable:
+            return range_not_satisfiable_response(stat.st_size, headers)
+        if byte_range is not None:
+            media_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+            return partial_file_response(file_path, *byte_range, stat.st_size, media_type, headers)
     
-    return FileResponse(file_path)
+    return FileResponse(file_path, stat_result=stat, headers=headers)
+
+
+# ============ ADMIN NOTIFICATIONS ============
+
+@api_router.get("/admin/notifications")
+async def admin_get_notifications(
+    status: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    email: str = Depends(verify_jwt_token),
+):
+    """Get notification outbox counts and the most recent entries (admin only)"""
+    query = {"status": status} if status else {}
+    counts, items = await asyncio.gather(
+        asyncio.gather(*[db.notification_outbox.count_documents({"status": s}) for s in OUTBOX_STATUSES]),
+        db.notification_outbox.find(query, {"_id": 0}).sort("created_at", -1).limit(limit).to_list(limit),
+    )
+    return {
+        "counts": dict(zip(OUTBOX_STATUSES, counts)),
+        "items": items
+    }
+
+@api_router.post("/admin/notifications/{notification_id}/retry")
+async def admin_retry_notification(notification_id: str, email: str = Depends(verify_jwt_token)):
+    """Requeue a dead-lettered notification (admin only)"""
+    entry = await retry_notification(db, notification_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Failed notification not found")
+    wake_outbox_worker()
+    return entry
+
+
+# ============ ADMIN METRICS ============
+
+@api_router.get("/admin/metrics")
+async def admin_get_metrics(email: str = Depends(verify_jwt_token)):
+    """Runtime metrics for caches and email delivery (admin only)"""
+    return {
+        "email": get_email_metrics(),
+        "blog_cache": {"entries": len(blog_cache), "max_entries": blog_cache.maxsize},
+        "jwt_cache": {"entries": len(jwt_cache), "max_entries": jwt_cache.maxsize},
+        "file_stat_cache": {"entries": len(file_stat_cache), "max_entries": file_stat_cache.maxsize},
+    }
 
 
 # ============ DASHBOARD STATS ============
@@ -556,36 +1186,34 @@ async def get_file(filename: str):
 @api_router.get("/admin/stats")
 async def admin_get_stats(email: str = Depends(verify_jwt_token)):
     """Get dashboard statistics (admin only)"""
-    contacts_count = await db.contacts.count_documents({})
-    contacts_pending = await db.contacts.count_documents({"status": "pending"})
-    
-    applications_count = await db.applications.count_documents({})
-    applications_pending = await db.applications.count_documents({"status": "pending"})
-    
-    blog_count = await db.blog_posts.count_documents({})
-    
-    # Count files
-    files_count = len(list(UPLOAD_DIR.glob('*'))) if UPLOAD_DIR.exists() else 0
-    
-    # Recent activity
-    recent_contacts = await db.contacts.find({}, {"_id": 0}).sort("created_at", -1).limit(5).to_list(5)
-    recent_applications = await db.applications.find({}, {"_id": 0}).sort("created_at", -1).limit(5).to_list(5)
+    # Counters are materialized by the write endpoints; the recent lists are
+    # index-backed. All three reads run concurrently in one round trip.
+    counters, recent_contacts, recent_applications = await asyncio.gather(
+        get_counters(db),
+        db.contacts.find({}, {"_id": 0}).sort([("created_at", -1), ("id", -1)]).limit(5).to_list(5),
+        db.applications.find({}, {"_id": 0}).sort([("created_at", -1), ("id", -1)]).limit(5).to_list(5),
+    )
     
     return {
         "contacts": {
-            "total": contacts_count,
-            "pending": contacts_pending
+            "total": counters["contacts_total"],
+            "pending": counters["contacts_pending"]
         },
         "applications": {
-            "total": applications_count,
-            "pending": applications_pending
+            "total": counters["applications_total"],
+            "pending": counters["applications_pending"]
         },
-        "blog_posts": blog_count,
-        "files": files_count,
+        "blog_posts": counters["blog_posts"],
+        "files": counters["files"],
         "recent_contacts": recent_contacts,
         "recent_applications": recent_applications
     }
 
+@api_router.post("/admin/stats/reconcile")
+async def admin_reconcile_stats(email: str = Depends(verify_jwt_token)):
+    """Recompute dashboard counters from the source collections (admin only)"""
+    return await reconcile_counters(db)
+
 
 # Include the router in the main app
 app.include_router(api_router)
@@ -597,14 +1225,77 @@ origins = [
     "http://localhost:3000", # For local testing
 ]
 
+@app.middleware("http")
+async def reject_oversized_uploads(request: Request, call_next):
+    """Refuse uploads that declare a body over the limit before it is received"""
+    if request.method == "POST" and request.url.path == "/api/admin/files/upload":
+        length = request.headers.get("content-length", "")
+        if length.isdigit() and int(length) > MAX_UPLOAD_REQUEST_BYTES:
+            return JSONResponse(
+                status_code=413,
+                content={"detail": f"File exceeds the {MAX_UPLOAD_MB} MB upload limit"},
+            )
+    return await call_next(request)
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
     allow_origins=origins,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count", "X-Next-Cursor", "Retry-After"],
 )
 
+@app.on_event("startup")
+async def prepare_database():
+    await ensure_indexes(db)
+    await asyncio.to_thread(remove_stale_temp_files, UPLOAD_DIR)
+    await asyncio.to_thread(remove_orphan_blobs, UPLOAD_DIR)
+    await asyncio.to_thread(remove_orphan_variants, UPLOAD_DIR)
+    await ensure_file_index(db, UPLOAD_DIR)
+    await ensure_counters(db)
+    await ensure_bootstrap_admin(db)
+    await ensure_processed_posts(db)
+
+@app.on_event("startup")
+async def start_blog_search():
+    global blog_search_refresh_task
+    await blog_search.refresh(db)
+    await refresh_related_posts()
+    blog_search_refresh_task = asyncio.create_task(refresh_blog_search())
+
+async def refresh_blog_search():
+    while True:
+        await asyncio.sleep(BLOG_SEARCH_REFRESH_SECONDS)
+        try:
+            if await blog_search.refresh(db):
+                await refresh_related_posts()
+        except Exception as e:
+            logger.error(f"Failed to refresh blog search index: {str(e)}")
+
+@app.on_event("startup")
+async def start_outbox_worker():
+    global outbox_worker
+    outbox_worker = OutboxWorker(
+        db,
+        concurrency=OUTBOX_CONCURRENCY,
+        max_attempts=OUTBOX_MAX_ATTEMPTS,
+        backoff_base=OUTBOX_BACKOFF_BASE_SECONDS,
+        backoff_max=OUTBOX_BACKOFF_MAX_SECONDS,
+        poll_interval=OUTBOX_POLL_SECONDS,
+        digest_window=NOTIFICATION_DIGEST_WINDOW_SECONDS,
+        digest_max_items=NOTIFICATION_DIGEST_MAX_ITEMS,
+        sent_retention=OUTBOX_SENT_RETENTION_DAYS * 86400,
+    )
+    outbox_worker.start()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    if blog_search_refresh_task is not None:
+        blog_search_refresh_task.cancel()
+    if outbox_worker is not None:
+        await outbox_worker.stop()
     client.close()
+    close_smtp_pool()
+    shutdown_password_executor()
+    shutdown_image_executor()
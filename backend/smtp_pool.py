@@ -0,0 +1,166 @@
+"""
+Pool of persistent, authenticated SMTP connections.
+Connections are reused across notifications, probed with NOOP after sitting
+idle, and transparently replaced when the server has dropped them.
+"""
+import logging
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Errors that mean the connection itself is unusable and should be replaced
+CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, OSError)
+
+# Errors a reused connection raises when the server has silently closed it
+STALE_CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, BrokenPipeError, ConnectionResetError)
+
+
+class _PooledConnection:
+    def __init__(self, smtp: smtplib.SMTP):
+        self.smtp = smtp
+        self.last_used = time.monotonic()
+        # Number of times this connection has been returned to the pool
+        self.uses = 0
+
+
+class SMTPConnectionPool:
+    """
+    Thread-safe pool of at most `size` SMTP sessions to one server.
+
+    - A connection idle longer than `keepalive_interval` seconds is checked
+      with NOOP before reuse; one idle longer than `max_idle` is closed.
+    - A send that fails because the connection dropped is retried once on
+      a fresh connection.
+    - `connect_timeout` bounds opening the connection; `send_timeout` bounds
+      every later socket operation (STARTTLS, login, NOOP, sending).
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        size: int = 2,
+        use_tls: bool = True,
+        keepalive_interval: float = 30,
+        max_idle: float = 240,
+        connect_timeout: float = 10,
+        send_timeout: float = 30,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.size = size
+        self.use_tls = use_tls
+        self.keepalive_interval = keepalive_interval
+        self.max_idle = max_idle
+        self.connect_timeout = connect_timeout
+        self.send_timeout = send_timeout
+        self._idle: List[_PooledConnection] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self._closed = False
+
+    def _connect(self) -> _PooledConnection:
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.connect_timeout)
+        try:
+            smtp.sock.settimeout(self.send_timeout)
+            if self.use_tls:
+                smtp.starttls()
+            if self.username and self.password:
+                smtp.login(self.username, self.password)
+        except Exception:
+            self._discard(smtp)
+            raise
+        logger.info(f"Opened SMTP connection to {self.host}:{self.port}")
+        return _PooledConnection(smtp)
+
+    @staticmethod
+    def _discard(smtp: smtplib.SMTP):
+        try:
+            smtp.quit()
+        except Exception:
+            smtp.close()
+
+    @staticmethod
+    def _is_alive(conn: _PooledConnection) -> bool:
+        try:
+            return conn.smtp.noop()[0] == 250
+        except CONNECTION_ERRORS + (smtplib.SMTPException,):
+            return False
+
+    def _checkout(self, fresh: bool = False) -> _PooledConnection:
+        """Take the most recently used healthy idle connection, or open a new one"""
+        while not fresh:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                return self._connect()
+            idle_for = time.monotonic() - conn.last_used
+            if idle_for > self.max_idle:
+                self._discard(conn.smtp)
+                continue
+            if idle_for > self.keepalive_interval and not self._is_alive(conn):
+                self._discard(conn.smtp)
+                continue
+            return conn
+        return self._connect()
+
+    def _checkin(self, conn: _PooledConnection):
+        conn.last_used = time.monotonic()
+        conn.uses += 1
+        with self._lock:
+            if not self._closed:
+                self._idle.append(conn)
+                return
+        self._discard(conn.smtp)
+
+    @contextmanager
+    def connection(self, fresh: bool = False):
+        """Borrow a connection (a new one if fresh); it is returned to the pool unless it failed"""
+        with self._borrow(fresh) as conn:
+            yield conn.smtp
+
+    @contextmanager
+    def _borrow(self, fresh: bool = False):
+        with self._slots:
+            conn = self._checkout(fresh)
+            try:
+                yield conn
+            except CONNECTION_ERRORS:
+                self._discard(conn.smtp)
+                raise
+            except Exception:
+                # Protocol-level errors (e.g. recipient refused) leave the session usable
+                self._checkin(conn)
+                raise
+            else:
+                self._checkin(conn)
+
+    def send(self, from_addr: str, to_addrs, message: str):
+        """Send a message, retrying once on a fresh connection if a reused one had dropped"""
+        reused = False
+        try:
+            with self._borrow() as conn:
+                reused = conn.uses > 0
+                return conn.smtp.sendmail(from_addr, to_addrs, message)
+        except STALE_CONNECTION_ERRORS:
+            if not reused:
+                raise
+            logger.info("Pooled SMTP connection was dropped, retrying on a new connection")
+            with self.connection(fresh=True) as smtp:
+                return smtp.sendmail(from_addr, to_addrs, message)
+
+    def close(self):
+        """Close all idle connections; connections in use are closed when returned"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            self._discard(conn.smtp)
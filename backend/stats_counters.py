@@ -0,0 +1,105 @@
+"""
+Materialized dashboard counters.
+Write endpoints keep a single stats document current with atomic $inc updates,
+so the admin dashboard reads its numbers with one O(1) lookup.
+Recompute the counters from the source collections to fix any drift with:
+    python stats_counters.py
+"""
+import asyncio
+import os
+from pathlib import Path
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+STATS_DOC_ID = "dashboard"
+
+COUNTER_FIELDS = [
+    "contacts_total",
+    "contacts_pending",
+    "applications_total",
+    "applications_pending",
+    "blog_posts",
+    "files",
+]
+
+
+async def increment_counters(db, **deltas: int):
+    """Atomically adjust one or more counters, e.g. increment_counters(db, contacts_total=1)"""
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    await db.stats.update_one({"_id": STATS_DOC_ID}, {"$inc": deltas}, upsert=True)
+
+
+def pending_delta(old_status, new_status) -> int:
+    """Change in the pending counter when a lead moves from old_status to new_status"""
+    return (new_status == "pending") - (old_status == "pending")
+
+
+async def get_counters(db) -> dict:
+    """Read the current counters, treating missing fields as zero"""
+    doc = await db.stats.find_one({"_id": STATS_DOC_ID}) or {}
+    return {field: doc.get(field, 0) for field in COUNTER_FIELDS}
+
+
+async def reconcile_counters(db) -> dict:
+    """Recompute every counter from the source collections and overwrite the stats document"""
+    (
+        contacts_total,
+        contacts_pending,
+        applications_total,
+        applications_pending,
+        blog_posts,
+        files,
+    ) = await asyncio.gather(
+        db.contacts.count_documents({}),
+        db.contacts.count_documents({"status": "pending"}),
+        db.applications.count_documents({}),
+        db.applications.count_documents({"status": "pending"}),
+        db.blog_posts.count_documents({}),
+        db.files.count_documents({}),
+    )
+    counters = {
+        "contacts_total": contacts_total,
+        "contacts_pending": contacts_pending,
+        "applications_total": applications_total,
+        "applications_pending": applications_pending,
+        "blog_posts": blog_posts,
+        "files": files,
+    }
+    await db.stats.update_one({"_id": STATS_DOC_ID}, {"$set": counters}, upsert=True)
+    return counters
+
+
+async def ensure_counters(db):
+    """Initialise the counters from the source collections if they have never been computed"""
+    if await db.stats.find_one({"_id": STATS_DOC_ID}) is None:
+        await reconcile_counters(db)
+
+
+async def main():
+    mongo_url = os.environ.get('MONGO_URL')
+    db_name = os.environ.get('DB_NAME')
+
+    if not mongo_url or not db_name:
+        print("Error: MONGO_URL or DB_NAME not found in environment")
+        return
+
+    client = AsyncIOMotorClient(mongo_url)
+    db = client[db_name]
+
+    before = await get_counters(db)
+    after = await reconcile_counters(db)
+    for field in COUNTER_FIELDS:
+        marker = "" if before[field] == after[field] else f" (was {before[field]})"
+        print(f"{field}: {after[field]}{marker}")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
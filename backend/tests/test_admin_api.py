@@ -6,6 +6,11 @@ import pytest
 import requests
 import os
 import uuid
+import hashlib
+import io
+import http.client
+from datetime import datetime, timezone
+from urllib.parse import urlparse
 
 BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
 
@@ -51,7 +56,22 @@ class TestAdminAuth:
             "password": "wrongpassword"
         })
         assert response.status_code == 401, f"Expected 401, got {response.status_code}"
-    
+
+    def test_admin_login_email_case_insensitive(self):
+        """Test admin accounts are looked up by normalized email"""
+        response = requests.post(f"{BASE_URL}/api/admin/login", json={
+            "email": ADMIN_EMAIL.upper(),
+            "password": ADMIN_PASSWORD
+        })
+        assert response.status_code == 200, f"Expected 200, got {response.status_code}: {response.text}"
+        assert response.json()["email"] == ADMIN_EMAIL
+
+        # The token identifies the stored account, not the casing typed at login
+        verify = requests.get(f"{BASE_URL}/api/admin/verify", headers={
+            "Authorization": f"Bearer {response.json()['token']}"
+        })
+        assert verify.json()["email"] == ADMIN_EMAIL
+
     def test_admin_verify_valid_token(self):
         """Test token verification with valid token"""
         # First login to get token
@@ -120,6 +140,34 @@ class TestAdminStats:
         assert "total" in data["applications"]
         assert "pending" in data["applications"]
     
+    def test_stats_counters_track_writes(self, auth_token):
+        """Test that contact writes keep the materialized counters current"""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+
+        def counts():
+            data = requests.get(f"{BASE_URL}/api/admin/stats", headers=headers).json()
+            return data["contacts"]["total"], data["contacts"]["pending"]
+
+        total, pending = counts()
+        create_response = requests.post(f"{BASE_URL}/api/contact", json={
+            "name": "TEST_Contact_Stats",
+            "company_name": "TEST_Company_Stats",
+            "mobile_number": "4444444444"
+        })
+        contact_id = create_response.json()["id"]
+        assert counts() == (total + 1, pending + 1)
+
+        requests.put(f"{BASE_URL}/api/admin/contacts/{contact_id}", json={"status": "contacted"}, headers=headers)
+        assert counts() == (total + 1, pending)
+
+        requests.delete(f"{BASE_URL}/api/admin/contacts/{contact_id}", headers=headers)
+        assert counts() == (total, pending)
+
+        # Reconcile recomputes the same values from the collections
+        response = requests.post(f"{BASE_URL}/api/admin/stats/reconcile", headers=headers)
+        assert response.status_code == 200
+        assert (response.json()["contacts_total"], response.json()["contacts_pending"]) == counts()
+
     def test_get_stats_unauthenticated(self):
         """Test getting stats without authentication"""
         response = requests.get(f"{BASE_URL}/api/admin/stats")
@@ -203,6 +251,64 @@ class TestAdminContacts:
         assert contact_id not in contact_ids
 
 
+    def test_contacts_pagination_and_filters(self, auth_token):
+        """Test keyset pagination with status filter and count header"""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        status = f"test-{uuid.uuid4().hex[:8]}"
+        contact_ids = []
+        for i in range(3):
+            create_response = requests.post(f"{BASE_URL}/api/contact", json={
+                "name": f"TEST_Contact_Page_{i}",
+                "company_name": "TEST_Company_Page",
+                "mobile_number": "5555555555"
+            })
+            contact_id = create_response.json()["id"]
+            contact_ids.append(contact_id)
+            requests.put(f"{BASE_URL}/api/admin/contacts/{contact_id}", json={"status": status}, headers=headers)
+
+        first = requests.get(f"{BASE_URL}/api/admin/contacts", params={"status": status, "limit": 2}, headers=headers)
+        assert first.status_code == 200
+        assert first.headers["X-Total-Count"] == "3"
+        assert len(first.json()) == 2
+        cursor = first.headers["X-Next-Cursor"]
+
+        second = requests.get(
+            f"{BASE_URL}/api/admin/contacts",
+            params={"status": status, "limit": 2, "after": cursor},
+            headers=headers
+        )
+        assert second.status_code == 200
+        assert len(second.json()) == 1
+        assert "X-Next-Cursor" not in second.headers
+
+        ids = [c["id"] for c in first.json() + second.json()]
+        assert sorted(ids) == sorted(contact_ids)
+        assert all(c["status"] == status for c in first.json() + second.json())
+
+        # Date range in the future matches nothing
+        future = requests.get(
+            f"{BASE_URL}/api/admin/contacts",
+            params={"status": status, "date_from": "2999-01-01"},
+            headers=headers
+        )
+        assert future.json() == []
+        assert future.headers["X-Total-Count"] == "0"
+
+        # A date-only date_to includes the whole of that day
+        today = datetime.now(timezone.utc).date().isoformat()
+        same_day = requests.get(
+            f"{BASE_URL}/api/admin/contacts",
+            params={"status": status, "date_from": today, "date_to": today},
+            headers=headers
+        )
+        assert same_day.headers["X-Total-Count"] == "3"
+        assert sorted(c["id"] for c in same_day.json()) == sorted(contact_ids)
+
+        # Cleanup
+        for contact_id in contact_ids:
+            requests.delete(f"{BASE_URL}/api/admin/contacts/{contact_id}", headers=headers)
+
+
 class TestAdminApplications:
     """Admin applications management tests"""
     
@@ -441,6 +547,338 @@ class TestAdminBlog:
         get_response = requests.get(f"{BASE_URL}/api/blog/{unique_slug}")
         assert get_response.status_code == 404
 
+    def test_public_blog_reflects_cms_writes(self, auth_token):
+        """Test that cached public blog reads are invalidated by CMS writes"""
+        old_slug = f"test-cache-{uuid.uuid4().hex[:8]}"
+        new_slug = f"{old_slug}-renamed"
+        post_data = {
+            "slug": old_slug,
+            "title": "Cached Title",
+            "excerpt": "Cached excerpt",
+            "content": "<p>Cached content</p>",
+            "category": "Testing",
+            "image": ""
+        }
+        headers = {"Authorization": f"Bearer {auth_token}"}
+
+        create_response = requests.post(f"{BASE_URL}/api/admin/blog", json=post_data, headers=headers)
+        assert create_response.status_code == 200
+
+        # Warm the public caches
+        assert requests.get(f"{BASE_URL}/api/blog/{old_slug}").status_code == 200
+        assert old_slug in [p["slug"] for p in requests.get(f"{BASE_URL}/api/blog").json()]
+
+        # Rename the post
+        post_data.update({"slug": new_slug, "title": "Renamed Title"})
+        update_response = requests.put(f"{BASE_URL}/api/admin/blog/{old_slug}", json=post_data, headers=headers)
+        assert update_response.status_code == 200
+
+        assert requests.get(f"{BASE_URL}/api/blog/{old_slug}").status_code == 404
+        renamed = requests.get(f"{BASE_URL}/api/blog/{new_slug}")
+        assert renamed.status_code == 200
+        assert renamed.json()["title"] == "Renamed Title"
+        slugs = [p["slug"] for p in requests.get(f"{BASE_URL}/api/blog").json()]
+        assert new_slug in slugs
+        assert old_slug not in slugs
+
+        # Delete and verify both caches drop the post
+        requests.delete(f"{BASE_URL}/api/admin/blog/{new_slug}", headers=headers)
+        assert requests.get(f"{BASE_URL}/api/blog/{new_slug}").status_code == 404
+        assert new_slug not in [p["slug"] for p in requests.get(f"{BASE_URL}/api/blog").json()]
+
+    def test_blog_conditional_get(self, auth_token):
+        """Test ETag revalidation on public blog reads and version bump on update"""
+        unique_slug = f"test-etag-{uuid.uuid4().hex[:8]}"
+        post_data = {
+            "slug": unique_slug,
+            "title": "ETag Title",
+            "excerpt": "ETag excerpt",
+            "content": "<p>ETag content</p>",
+            "category": "Testing",
+            "image": ""
+        }
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        requests.post(f"{BASE_URL}/api/admin/blog", json=post_data, headers=headers)
+
+        for url in [f"{BASE_URL}/api/blog/{unique_slug}", f"{BASE_URL}/api/blog"]:
+            response = requests.get(url)
+            assert response.status_code == 200
+            etag = response.headers["ETag"]
+            assert "Last-Modified" in response.headers
+
+            not_modified = requests.get(url, headers={"If-None-Match": etag})
+            assert not_modified.status_code == 304
+            assert not_modified.headers["ETag"] == etag
+            assert not_modified.content == b""
+
+        # A CMS write must change the validator
+        post_data["title"] = "ETag Title Updated"
+        requests.put(f"{BASE_URL}/api/admin/blog/{unique_slug}", json=post_data, headers=headers)
+        response = requests.get(f"{BASE_URL}/api/blog/{unique_slug}", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+
+        # Cleanup
+        requests.delete(f"{BASE_URL}/api/admin/blog/{unique_slug}", headers=headers)
+
+
+    def test_blog_index_pagination(self, auth_token):
+        """Test that the summary index pages through every post without bodies"""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        slugs = [f"test-index-{uuid.uuid4().hex[:8]}" for _ in range(3)]
+        for slug in slugs:
+            requests.post(f"{BASE_URL}/api/admin/blog", json={
+                "slug": slug,
+                "title": "Index Post",
+                "excerpt": "Index excerpt",
+                "content": "<p>Index content</p>",
+                "category": "Testing",
+                "image": ""
+            }, headers=headers)
+
+        seen = []
+        cursor = None
+        while True:
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = requests.get(f"{BASE_URL}/api/blog/index", params=params)
+            assert response.status_code == 200
+            data = response.json()
+            assert len(data["items"]) <= 2
+            for item in data["items"]:
+                assert "content" not in item
+                assert "faqs" not in item
+                seen.append(item["slug"])
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+
+        assert len(seen) == len(set(seen))
+        for slug in slugs:
+            assert slug in seen
+
+        # Malformed cursors are rejected
+        response = requests.get(f"{BASE_URL}/api/blog/index", params={"cursor": "not-a-cursor"})
+        assert response.status_code == 400
+
+        # Cleanup
+        for slug in slugs:
+            requests.delete(f"{BASE_URL}/api/admin/blog/{slug}", headers=headers)
+
+    def test_blog_search(self, auth_token):
+        """Test full-text search ranking, snippets, category filter and CMS updates"""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        word = f"zq{uuid.uuid4().hex[:8]}"
+        slugs = [f"test-search-{uuid.uuid4().hex[:8]}" for _ in range(2)]
+        requests.post(f"{BASE_URL}/api/admin/blog", json={
+            "slug": slugs[0],
+            "title": f"{word} in the title",
+            "excerpt": "Search excerpt",
+            "content": "<p>Body text without the term</p>",
+            "category": "Search Testing",
+            "image": ""
+        }, headers=headers)
+        requests.post(f"{BASE_URL}/api/admin/blog", json={
+            "slug": slugs[1],
+            "title": "Another post",
+            "excerpt": "Search excerpt",
+            "content": f"<p>The body mentions <b>{word}</b> once.</p>",
+            "category": "Other Testing",
+            "image": ""
+        }, headers=headers)
+
+        response = requests.get(f"{BASE_URL}/api/blog/search", params={"q": word.upper()})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 2
+        # Title matches outrank body matches
+        assert [r["slug"] for r in data["results"]] == slugs
+        assert word in data["results"][1]["snippet"]
+        assert "<b>" not in data["results"][1]["snippet"]
+        assert "content" not in data["results"][0]
+
+        filtered = requests.get(f"{BASE_URL}/api/blog/search", params={"q": word, "category": "other testing"}).json()
+        assert [r["slug"] for r in filtered["results"]] == [slugs[1]]
+
+        # Updates and deletes are reflected immediately
+        requests.put(f"{BASE_URL}/api/admin/blog/{slugs[1]}", json={
+            "slug": slugs[1],
+            "title": "Another post",
+            "excerpt": "Search excerpt",
+            "content": "<p>No longer mentioned</p>",
+            "category": "Other Testing",
+            "image": ""
+        }, headers=headers)
+        requests.delete(f"{BASE_URL}/api/admin/blog/{slugs[0]}", headers=headers)
+        assert requests.get(f"{BASE_URL}/api/blog/search", params={"q": word}).json()["total"] == 0
+
+        assert requests.get(f"{BASE_URL}/api/blog/search").status_code == 422
+
+        # Cleanup
+        requests.delete(f"{BASE_URL}/api/admin/blog/{slugs[1]}", headers=headers)
+
+    def test_blog_related_posts(self, auth_token):
+        """Test that a post links to the posts sharing its vocabulary"""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        topic = " ".join(f"zr{uuid.uuid4().hex[:6]}" for _ in range(5))
+        slugs = [f"test-related-{uuid.uuid4().hex[:8]}" for _ in range(3)]
+        posts = [
+            ("Valuation guide", f"<p>{topic} valuation</p>"),
+            ("Listing guide", f"<p>{topic} listing</p>"),
+            ("Gardening notes", "<p>Completely unrelated soil and seeds</p>"),
+        ]
+        for slug, (title, content) in zip(slugs, posts):
+            requests.post(f"{BASE_URL}/api/admin/blog", json={
+                "slug": slug,
+                "title": title,
+                "excerpt": title,
+                "content": content,
+                "category": "Testing",
+                "image": ""
+            }, headers=headers)
+
+        response = requests.get(f"{BASE_URL}/api/blog/{slugs[0]}")
+        assert response.status_code == 200
+        related = [r["slug"] for r in response.json()["related"]]
+        assert related[0] == slugs[1]
+        assert slugs[2] not in related
+        assert "content" not in response.json()["related"][0]
+
+        # Deleting the neighbour drops it from the table and changes the ETag
+        requests.delete(f"{BASE_URL}/api/admin/blog/{slugs[1]}", headers=headers)
+        updated = requests.get(f"{BASE_URL}/api/blog/{slugs[0]}")
+        assert slugs[1] not in [r["slug"] for r in updated.json()["related"]]
+        assert updated.headers["ETag"] != response.headers["ETag"]
+
+        # Cleanup
+        for slug in (slugs[0], slugs[2]):
+            requests.delete(f"{BASE_URL}/api/admin/blog/{slug}", headers=headers)
+
+    def test_blog_content_processed_on_write(self, auth_token):
+        """Test that post HTML is sanitized and minified and derived fields are stored"""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        slug = f"test-content-{uuid.uuid4().hex[:8]}"
+        content = """
+            <h2>First Section</h2>
+            <p onclick="steal()">Some   <strong>bold</strong> words<script>alert(1)</script></p>
+            <h2>First Section</h2>
+            <p><a href="javascript:alert(1)">link</a></p>
+            <p>a<br>b</p>
+        """
+        response = requests.post(f"{BASE_URL}/api/admin/blog", json={
+            "slug": slug,
+            "title": "Content Test",
+            "excerpt": "Content test excerpt",
+            "content": content,
+            "category": "Testing",
+            "image": ""
+        }, headers=headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["content"] == (
+            '<h2 id="first-section">First Section</h2><p>Some <strong>bold</strong> words</p>'
+            '<h2 id="first-section-2">First Section</h2><p><a>link</a></p><p>a<br>b</p>'
+        )
+        assert [entry["id"] for entry in data["toc"]] == ["first-section", "first-section-2"]
+        assert data["word_count"] == 10
+        assert data["read_time"] == "1 min read"
+
+        public = requests.get(f"{BASE_URL}/api/blog/{slug}").json()
+        assert public["content"] == data["content"]
+        assert "text" not in public
+        assert "content_source" not in public
+
+        # The editor gets the HTML as submitted
+        admin_posts = requests.get(f"{BASE_URL}/api/admin/blog", headers=headers).json()
+        assert next(p for p in admin_posts if p["slug"] == slug)["content"] == content
+
+        # Cleanup
+        requests.delete(f"{BASE_URL}/api/admin/blog/{slug}", headers=headers)
+
+    def test_blog_static_export_is_incremental(self, auth_token):
+        """Test that the static export only re-renders posts that changed"""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        response = requests.post(f"{BASE_URL}/api/admin/blog/export", headers=headers)
+        assert response.status_code == 200
+
+        # Nothing changed since the previous export
+        data = requests.post(f"{BASE_URL}/api/admin/blog/export", headers=headers).json()
+        assert data["posts_rendered"] == 0
+        assert data["files_written"] == 0
+
+        slug = f"test-export-{uuid.uuid4().hex[:8]}"
+        requests.post(f"{BASE_URL}/api/admin/blog", json={
+            "slug": slug,
+            "title": "Export Test",
+            "excerpt": "Export test excerpt",
+            "content": "<p>Export test content</p>",
+            "category": "Testing",
+            "image": ""
+        }, headers=headers)
+        data = requests.post(f"{BASE_URL}/api/admin/blog/export", headers=headers).json()
+        assert data["posts_rendered"] >= 1
+        assert data["posts_unchanged"] >= 0
+
+        # The deleted post's JSON and HTML pages are removed
+        requests.delete(f"{BASE_URL}/api/admin/blog/{slug}", headers=headers)
+        data = requests.post(f"{BASE_URL}/api/admin/blog/export", headers=headers).json()
+        assert data["files_removed"] >= 2
+
+    def test_blog_invalid_slug_rejected(self, auth_token):
+        """Test that slugs must be lowercase words joined by hyphens"""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        for slug in ("../../escaped", "Upper-Case", "with space", "trailing-"):
+            response = requests.post(f"{BASE_URL}/api/admin/blog", json={
+                "slug": slug,
+                "title": "Invalid Slug Test",
+                "excerpt": "Invalid slug test excerpt",
+                "content": "<p>Invalid slug test content</p>",
+                "category": "Testing",
+                "image": ""
+            }, headers=headers)
+            assert response.status_code == 400
+
+    def test_blog_static_export_unauthenticated(self):
+        """Test that exporting requires authentication"""
+        response = requests.post(f"{BASE_URL}/api/admin/blog/export")
+        assert response.status_code in [401, 403]
+
+    def test_blog_categories_and_filter(self, auth_token):
+        """Test category counts and category-filtered listings"""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        category = f"Test Category {uuid.uuid4().hex[:8]}"
+        slugs = [f"test-category-{uuid.uuid4().hex[:8]}" for _ in range(2)]
+        for slug in slugs:
+            requests.post(f"{BASE_URL}/api/admin/blog", json={
+                "slug": slug,
+                "title": "Category Test",
+                "excerpt": "Category test excerpt",
+                "content": "<p>Category test content</p>",
+                "category": category,
+                "image": ""
+            }, headers=headers)
+
+        response = requests.get(f"{BASE_URL}/api/blog/categories")
+        assert response.status_code == 200
+        counts = {c["name"]: c["count"] for c in response.json()}
+        assert counts[category] == 2
+        assert requests.get(f"{BASE_URL}/api/blog/categories", headers={
+            "If-None-Match": response.headers["ETag"]
+        }).status_code == 304
+
+        listing = requests.get(f"{BASE_URL}/api/blog", params={"category": category}).json()
+        assert sorted(p["slug"] for p in listing) == sorted(slugs)
+        page = requests.get(f"{BASE_URL}/api/blog/index", params={"category": category, "limit": 1}).json()
+        assert len(page["items"]) == 1 and page["items"][0]["slug"] in slugs
+
+        # A CMS write invalidates the cached counts
+        requests.delete(f"{BASE_URL}/api/admin/blog/{slugs[0]}", headers=headers)
+        counts = {c["name"]: c["count"] for c in requests.get(f"{BASE_URL}/api/blog/categories").json()}
+        assert counts[category] == 1
+
+        # Cleanup
+        requests.delete(f"{BASE_URL}/api/admin/blog/{slugs[1]}", headers=headers)
+
 
 class TestAdminFiles:
     """Admin file manager tests"""
@@ -504,7 +942,134 @@ class TestAdminFiles:
         )
         file_names2 = [f["name"] for f in list_response2.json()]
         assert filename not in file_names2
-    
+
+    def test_upload_returns_checksum(self, auth_token):
+        """Test upload reports the SHA-256 of the stored content and strips client paths"""
+        test_content = b"Checksum test content " * 1000
+        files = {
+            'file': ('../nested/checksum_test.txt', test_content, 'text/plain')
+        }
+
+        upload_response = requests.post(
+            f"{BASE_URL}/api/admin/files/upload",
+            files=files,
+            headers={"Authorization": f"Bearer {auth_token}"}
+        )
+        assert upload_response.status_code == 200, f"Upload failed: {upload_response.text}"
+
+        data = upload_response.json()
+        assert data["sha256"] == hashlib.sha256(test_content).hexdigest()
+        assert data["size"] == len(test_content)
+        assert data["name"].endswith("_checksum_test.txt")
+        assert "/" not in data["name"]
+
+        requests.delete(
+            f"{BASE_URL}/api/admin/files/{data['name']}",
+            headers={"Authorization": f"Bearer {auth_token}"}
+        )
+
+    def test_files_pagination_and_type_filter(self, auth_token):
+        """Test file listing pages through the index and filters by type"""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        names = []
+        for i in range(2):
+            response = requests.post(
+                f"{BASE_URL}/api/admin/files/upload",
+                files={'file': (f'page_test_{i}.png', f"image {i}".encode(), 'image/png')},
+                headers=headers
+            )
+            assert response.json()["uploader"] == ADMIN_EMAIL
+            names.append(response.json()["name"])
+
+        first = requests.get(f"{BASE_URL}/api/admin/files", params={"type": "image", "limit": 1}, headers=headers)
+        assert first.status_code == 200
+        assert int(first.headers["X-Total-Count"]) >= 2
+        assert [f["name"] for f in first.json()] == [names[1]]
+
+        second = requests.get(
+            f"{BASE_URL}/api/admin/files",
+            params={"type": "image", "limit": 1, "after": first.headers["X-Next-Cursor"]},
+            headers=headers
+        )
+        assert [f["name"] for f in second.json()] == [names[0]]
+
+        documents = requests.get(f"{BASE_URL}/api/admin/files", params={"type": "document"}, headers=headers)
+        assert not set(names) & {f["name"] for f in documents.json()}
+
+        invalid = requests.get(f"{BASE_URL}/api/admin/files", params={"type": "video"}, headers=headers)
+        assert invalid.status_code == 400
+
+        # Cleanup
+        for name in names:
+            requests.delete(f"{BASE_URL}/api/admin/files/{name}", headers=headers)
+
+    def test_duplicate_uploads_share_content(self, auth_token):
+        """Test identical uploads get separate names and deleting one keeps the other"""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        test_content = f"Dedup test content {uuid.uuid4()}".encode()
+
+        names = []
+        for _ in range(2):
+            response = requests.post(
+                f"{BASE_URL}/api/admin/files/upload",
+                files={'file': ('dedup_test.txt', test_content, 'text/plain')},
+                headers=headers
+            )
+            assert response.status_code == 200
+            names.append(response.json()["name"])
+        assert names[0] != names[1]
+
+        requests.delete(f"{BASE_URL}/api/admin/files/{names[0]}", headers=headers)
+        assert requests.get(f"{BASE_URL}/api/files/{names[0]}").status_code == 404
+
+        response = requests.get(f"{BASE_URL}/api/files/{names[1]}")
+        assert response.status_code == 200
+        assert response.content == test_content
+
+        requests.delete(f"{BASE_URL}/api/admin/files/{names[1]}", headers=headers)
+        assert requests.get(f"{BASE_URL}/api/files/{names[1]}").status_code == 404
+
+    def test_upload_rejected_by_declared_size(self, auth_token):
+        """Test that an upload declaring an oversized body is refused before it is sent"""
+        url = urlparse(BASE_URL)
+        connection_class = http.client.HTTPSConnection if url.scheme == "https" else http.client.HTTPConnection
+        connection = connection_class(url.netloc, timeout=10)
+        try:
+            connection.putrequest("POST", "/api/admin/files/upload")
+            connection.putheader("Authorization", f"Bearer {auth_token}")
+            connection.putheader("Content-Type", "multipart/form-data; boundary=test")
+            connection.putheader("Content-Length", str(10 * 1024 ** 3))
+            connection.endheaders()
+            # No body is sent; the server must answer from the headers alone
+            assert connection.getresponse().status == 413
+        finally:
+            connection.close()
+
+    def test_delete_hidden_entries_not_found(self, auth_token):
+        """Test that temp files, blobs and variants cannot be deleted by name"""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        for name in (".blobs", ".variants", ".upload-test"):
+            response = requests.delete(f"{BASE_URL}/api/admin/files/{name}", headers=headers)
+            assert response.status_code == 404
+
+    def test_delete_file_rejects_traversal(self, auth_token):
+        """Test that a dot-dot name cannot reach the upload directory itself"""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        upload = requests.post(
+            f"{BASE_URL}/api/admin/files/upload",
+            files={'file': ('traversal_test.txt', b"Traversal test content", 'text/plain')},
+            headers=headers
+        )
+        filename = upload.json()["name"]
+
+        response = requests.delete(f"{BASE_URL}/api/admin/files/%2E%2E", headers=headers)
+        assert response.status_code == 404
+        assert response.json()["detail"] == "File not found"
+        assert requests.get(f"{BASE_URL}/api/files/{filename}").status_code == 200
+
+        # Cleanup
+        requests.delete(f"{BASE_URL}/api/admin/files/{filename}", headers=headers)
+
     def test_public_file_access(self, auth_token):
         """Test that uploaded files are publicly accessible"""
         # Upload a test file
@@ -534,6 +1099,174 @@ class TestAdminFiles:
         )
 
 
+    def test_public_file_conditional_get(self, auth_token):
+        """Test that public files honour If-None-Match and If-Modified-Since"""
+        files = {
+            'file': ('etag_test.txt', b"ETag test content", 'text/plain')
+        }
+        upload_response = requests.post(
+            f"{BASE_URL}/api/admin/files/upload",
+            files=files,
+            headers={"Authorization": f"Bearer {auth_token}"}
+        )
+        filename = upload_response.json()["name"]
+
+        response = requests.get(f"{BASE_URL}/api/files/{filename}")
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+        last_modified = response.headers["Last-Modified"]
+
+        assert requests.get(f"{BASE_URL}/api/files/{filename}", headers={"If-None-Match": etag}).status_code == 304
+        assert requests.get(f"{BASE_URL}/api/files/{filename}", headers={"If-Modified-Since": last_modified}).status_code == 304
+
+        # Cleanup
+        requests.delete(
+            f"{BASE_URL}/api/admin/files/{filename}",
+            headers={"Authorization": f"Bearer {auth_token}"}
+        )
+
+    def test_public_file_range_requests(self, auth_token):
+        """Test that public files are immutable-cached and serve byte ranges"""
+        test_content = bytes(range(256)) * 4
+        upload_response = requests.post(
+            f"{BASE_URL}/api/admin/files/upload",
+            files={'file': ('range_test.pdf', test_content, 'application/pdf')},
+            headers={"Authorization": f"Bearer {auth_token}"}
+        )
+        filename = upload_response.json()["name"]
+        url = f"{BASE_URL}/api/files/{filename}"
+
+        response = requests.get(url)
+        assert response.status_code == 200
+        assert "immutable" in response.headers["Cache-Control"]
+        assert response.headers["Accept-Ranges"] == "bytes"
+        etag = response.headers["ETag"]
+
+        partial = requests.get(url, headers={"Range": "bytes=100-199"})
+        assert partial.status_code == 206
+        assert partial.headers["Content-Range"] == f"bytes 100-199/{len(test_content)}"
+        assert partial.content == test_content[100:200]
+
+        suffix = requests.get(url, headers={"Range": "bytes=-24"})
+        assert suffix.status_code == 206
+        assert suffix.content == test_content[-24:]
+
+        # A stale If-Range falls back to the full file
+        stale = requests.get(url, headers={"Range": "bytes=0-9", "If-Range": '"stale"'})
+        assert stale.status_code == 200
+        assert stale.content == test_content
+        assert requests.get(url, headers={"Range": "bytes=0-9", "If-Range": etag}).status_code == 206
+
+        unsatisfiable = requests.get(url, headers={"Range": f"bytes={len(test_content)}-"})
+        assert unsatisfiable.status_code == 416
+        assert unsatisfiable.headers["Content-Range"] == f"bytes */{len(test_content)}"
+
+        # Cleanup
+        requests.delete(
+            f"{BASE_URL}/api/admin/files/{filename}",
+            headers={"Authorization": f"Bearer {auth_token}"}
+        )
+        assert requests.get(url).status_code == 404
+
+    def test_public_image_variants(self, auth_token):
+        """Test that ?w= serves a resized image, as WebP when accepted"""
+        Image = pytest.importorskip("PIL.Image")
+        buffer = io.BytesIO()
+        Image.new("RGB", (1200, 600), (212, 175, 55)).save(buffer, format="PNG")
+        upload_response = requests.post(
+            f"{BASE_URL}/api/admin/files/upload",
+            files={'file': ('variant_test.png', buffer.getvalue(), 'image/png')},
+            headers={"Authorization": f"Bearer {auth_token}"}
+        )
+        filename = upload_response.json()["name"]
+        url = f"{BASE_URL}/api/files/{filename}"
+
+        resized = requests.get(url, params={"w": 300}, headers={"Accept": "image/png"})
+        assert resized.status_code == 200
+        assert resized.headers["Content-Type"] == "image/png"
+        assert "Accept" in resized.headers["Vary"]
+        assert Image.open(io.BytesIO(resized.content)).size == (320, 160)
+
+        webp = requests.get(url, params={"w": 800}, headers={"Accept": "image/webp,image/*"})
+        assert webp.status_code == 200
+        assert webp.headers["Content-Type"] == "image/webp"
+        assert Image.open(io.BytesIO(webp.content)).size == (800, 400)
+        assert requests.get(
+            url, params={"w": 800}, headers={"Accept": "image/webp", "If-None-Match": webp.headers["ETag"]}
+        ).status_code == 304
+
+        # Never upscaled beyond the original
+        largest = requests.get(url, params={"w": 5000}, headers={"Accept": "image/png"})
+        assert Image.open(io.BytesIO(largest.content)).size == (1200, 600)
+
+        # Cleanup
+        requests.delete(
+            f"{BASE_URL}/api/admin/files/{filename}",
+            headers={"Authorization": f"Bearer {auth_token}"}
+        )
+        assert requests.get(url, params={"w": 320}).status_code == 404
+
+
+class TestAdminNotifications:
+    """Notification outbox admin view tests"""
+
+    def test_submission_is_queued_in_outbox(self, auth_token):
+        """Test that a contact submission writes an outbox entry"""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        create_response = requests.post(f"{BASE_URL}/api/contact", json={
+            "name": "TEST_Contact_Outbox",
+            "company_name": "TEST_Company_Outbox",
+            "mobile_number": "3333333333"
+        })
+        assert create_response.status_code == 200
+        contact_id = create_response.json()["id"]
+
+        response = requests.get(f"{BASE_URL}/api/admin/notifications", headers=headers)
+        assert response.status_code == 200
+        data = response.json()
+        for status in ["pending", "sending", "sent", "failed"]:
+            assert status in data["counts"]
+
+        entries = [n for n in data["items"] if n["payload"].get("id") == contact_id]
+        assert len(entries) == 1
+        assert entries[0]["kind"] == "contact"
+        assert entries[0]["status"] in ["pending", "sending", "sent", "failed"]
+
+        # Cleanup
+        requests.delete(f"{BASE_URL}/api/admin/contacts/{contact_id}", headers=headers)
+
+    def test_retry_unknown_notification(self, auth_token):
+        """Test retrying a notification that is not dead-lettered"""
+        response = requests.post(
+            f"{BASE_URL}/api/admin/notifications/{uuid.uuid4()}/retry",
+            headers={"Authorization": f"Bearer {auth_token}"}
+        )
+        assert response.status_code == 404
+
+    def test_notifications_requires_auth(self):
+        response = requests.get(f"{BASE_URL}/api/admin/notifications")
+        assert response.status_code in [401, 403]
+
+
+class TestAdminMetrics:
+    """Runtime metrics endpoint tests"""
+
+    def test_get_metrics(self, auth_token):
+        """Test that SMTP circuit breaker state is reported"""
+        response = requests.get(f"{BASE_URL}/api/admin/metrics", headers={
+            "Authorization": f"Bearer {auth_token}"
+        })
+        assert response.status_code == 200
+
+        circuit = response.json()["email"]["smtp_circuit"]
+        assert circuit["state"] in ["closed", "open", "half_open"]
+        assert "consecutive_failures" in circuit
+
+    def test_metrics_requires_auth(self):
+        response = requests.get(f"{BASE_URL}/api/admin/metrics")
+        assert response.status_code in [401, 403]
+
+
 class TestAdminEndpointSecurity:
     """Test that all admin endpoints require authentication"""
     
@@ -375,5 +375,24 @@ class TestStatusAPI:
         print(f"✓ Get status checks returns {len(data)} records")
 
 
+class TestRateLimiting:
+    """Public form rate limit tests; runs last because it spends the application budget"""
+    
+    def test_application_burst_rejected_with_retry_after(self):
+        """Test that submissions beyond the burst get 429 with Retry-After"""
+        # Invalid bodies still spend a token but never create an application
+        for _ in range(100):
+            response = requests.post(f"{BASE_URL}/api/application", json={})
+            if response.status_code == 429:
+                break
+            assert response.status_code == 422
+        else:
+            pytest.skip("Rate limiting is disabled or the burst is above 100")
+        
+        assert response.json()["detail"] == "Too many requests, please try again later"
+        assert int(response.headers["Retry-After"]) >= 1
+        print(f"✓ Burst rejected with Retry-After: {response.headers['Retry-After']}")
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "--tb=short"])
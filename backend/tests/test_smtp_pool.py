@@ -0,0 +1,137 @@
+"""
+SMTP Connection Pool Tests
+Tests: connection reuse and reconnecting after a dropped connection, against a
+local SMTP stand-in with SMTP_USE_TLS=false
+"""
+import socketserver
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import email_service  # noqa: E402
+
+
+class StandInSMTPServer(socketserver.ThreadingTCPServer):
+    """Minimal SMTP server that accepts any login and records sessions and messages"""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StandInSMTPHandler)
+        self.sessions = 0
+        self.messages = []
+        self.open_sockets = set()
+        self.lock = threading.Lock()
+
+    def drop_connections(self):
+        """Close every open session from the server side, as an idle timeout would"""
+        with self.lock:
+            sockets, self.open_sockets = self.open_sockets, set()
+        for sock in sockets:
+            try:
+                sock.shutdown(2)
+            except OSError:
+                pass
+            sock.close()
+
+
+class StandInSMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line: str):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        with self.server.lock:
+            self.server.sessions += 1
+            self.server.open_sockets.add(self.connection)
+        self.reply("220 stand-in ESMTP")
+        try:
+            while True:
+                line = self.rfile.readline()
+                if not line:
+                    return
+                command = line.decode().strip().upper()
+                if command.startswith("EHLO"):
+                    self.reply("250-stand-in")
+                    self.reply("250 AUTH PLAIN LOGIN")
+                elif command.startswith("HELO"):
+                    self.reply("250 stand-in")
+                elif command.startswith("AUTH"):
+                    self.reply("235 Authentication successful")
+                elif command.startswith("DATA"):
+                    self.reply("354 End data with <CR><LF>.<CR><LF>")
+                    body = []
+                    for data_line in iter(self.rfile.readline, b""):
+                        if data_line.rstrip(b"\r\n") == b".":
+                            break
+                        body.append(data_line)
+                    with self.server.lock:
+                        self.server.messages.append(b"".join(body))
+                    self.reply("250 OK")
+                elif command.startswith("QUIT"):
+                    self.reply("221 Bye")
+                    return
+                else:
+                    # MAIL, RCPT, RSET and NOOP
+                    self.reply("250 OK")
+        except OSError:
+            return
+        finally:
+            with self.server.lock:
+                self.server.open_sockets.discard(self.connection)
+
+
+@pytest.fixture
+def smtp_server(monkeypatch):
+    """Stand-in server with the email service configured to send to it without TLS"""
+    server = StandInSMTPServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    monkeypatch.setenv("SMTP_HOST", "127.0.0.1")
+    monkeypatch.setenv("SMTP_PORT", str(server.server_address[1]))
+    monkeypatch.setenv("SMTP_USE_TLS", "false")
+    monkeypatch.setenv("GMAIL_USER", "sender@example.com")
+    monkeypatch.setenv("GMAIL_APP_PASSWORD", "app-password")
+    monkeypatch.setenv("NOTIFICATION_EMAIL", "team@example.com")
+    email_service.close_smtp_pool()
+    monkeypatch.setattr(email_service, "_settings", None)
+    yield server
+
+    email_service.close_smtp_pool()
+    server.shutdown()
+    server.server_close()
+
+
+CONTACT = {
+    "name": "TEST_SMTP_Contact",
+    "company_name": "TEST_SMTP_Company",
+    "mobile_number": "1234567890",
+    "email": "lead@example.com",
+}
+
+
+class TestSMTPConnectionPool:
+    """SMTP pool behaviour against a local stand-in server"""
+
+    def test_sends_reuse_one_session(self, smtp_server):
+        """Test that consecutive notifications share one SMTP session"""
+        for _ in range(5):
+            email_service.send_contact_notification(CONTACT)
+
+        assert len(smtp_server.messages) == 5
+        assert smtp_server.sessions == 1
+        assert b"TEST_SMTP_Contact" in smtp_server.messages[0]
+
+    def test_reconnects_after_dropped_connection(self, smtp_server):
+        """Test that a send on a connection the server dropped is retried on a new session"""
+        email_service.send_contact_notification(CONTACT)
+        smtp_server.drop_connections()
+
+        email_service.send_contact_notification(CONTACT)
+
+        assert len(smtp_server.messages) == 2
+        assert smtp_server.sessions == 2
@@ -6,6 +6,9 @@ import { getApplications, updateApplication, deleteApplication } from '../../../
 const ApplicationsTab = () => {
   const [applications, setApplications] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [totalCount, setTotalCount] = useState(0);
   const [searchTerm, setSearchTerm] = useState('');
   const [statusFilter, setStatusFilter] = useState('all');
   const [editingId, setEditingId] = useState(null);
@@ -13,12 +16,17 @@ const ApplicationsTab = () => {
 
   useEffect(() => {
     fetchApplications();
-  }, []);
+  }, [statusFilter]);
+
+  // Status filtering happens on the server so totals and paging stay correct
+  const pageFilters = () => ({ status: statusFilter === 'all' ? undefined : statusFilter });
 
   const fetchApplications = async () => {
     try {
-      const data = await getApplications();
-      setApplications(data);
+      const page = await getApplications(pageFilters());
+      setApplications(page.items);
+      setNextCursor(page.nextCursor);
+      setTotalCount(page.total);
     } catch (error) {
       toast.error('Failed to load applications');
     } finally {
@@ -26,12 +34,27 @@ const ApplicationsTab = () => {
     }
   };
 
+  const loadMore = async () => {
+    setLoadingMore(true);
+    try {
+      const page = await getApplications({ ...pageFilters(), after: nextCursor });
+      setApplications(prev => [...prev, ...page.items]);
+      setNextCursor(page.nextCursor);
+      setTotalCount(page.total);
+    } catch (error) {
+      toast.error('Failed to load more applications');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleUpdateStatus = async (id) => {
     try {
       await updateApplication(id, { status: editStatus });
       toast.success('Application updated');
       setEditingId(null);
-      fetchApplications();
+      // Update in place so the pages loaded so far stay loaded
+      setApplications(prev => prev.map(item => item.id === id ? { ...item, status: editStatus } : item));
     } catch (error) {
       toast.error('Failed to update application');
     }
@@ -43,7 +66,8 @@ const ApplicationsTab = () => {
     try {
       await deleteApplication(id);
       toast.success('Application deleted');
-      fetchApplications();
+      setApplications(prev => prev.filter(item => item.id !== id));
+      setTotalCount(prev => prev - 1);
     } catch (error) {
       toast.error('Failed to delete application');
     }
@@ -58,8 +82,7 @@ const ApplicationsTab = () => {
     const matchesSearch = 
       app.name?.toLowerCase().includes(searchTerm.toLowerCase()) ||
       app.company_name?.toLowerCase().includes(searchTerm.toLowerCase());
-    const matchesStatus = statusFilter === 'all' || app.status === statusFilter;
-    return matchesSearch && matchesStatus;
+    return matchesSearch;
   });
 
   const statusOptions = ['pending', 'reviewing', 'qualified', 'contacted', 'converted', 'rejected'];
@@ -107,7 +130,7 @@ const ApplicationsTab = () => {
             IPO Applications
           </h1>
           <p style={{ color: '#6B7280', fontSize: '14px' }}>
-            {filteredApplications.length} total applications
+            Showing {filteredApplications.length} of {totalCount} applications
           </p>
         </div>
 
@@ -285,6 +308,14 @@ const ApplicationsTab = () => {
           </table>
         </div>
       </div>
+
+      {nextCursor && (
+        <div style={{ display: 'flex', justifyContent: 'center', marginTop: '20px' }}>
+          <button onClick={loadMore} disabled={loadingMore} style={loadMoreBtnStyle}>
+            {loadingMore ? 'Loading...' : `Load more (${totalCount - applications.length} remaining)`}
+          </button>
+        </div>
+      )}
     </div>
   );
 };
@@ -305,6 +336,16 @@ const tdStyle = {
   fontSize: '14px'
 };
 
+const loadMoreBtnStyle = {
+  padding: '10px 24px',
+  background: 'rgba(212, 175, 55, 0.1)',
+  border: '1px solid rgba(212, 175, 55, 0.3)',
+  color: '#D4AF37',
+  fontSize: '14px',
+  fontWeight: '600',
+  cursor: 'pointer'
+};
+
 const actionBtnStyle = {
   background: 'none',
   border: 'none',
@@ -423,7 +423,6 @@ const BlogTab = () => {
     author: 'Rushabh Ventures Team',
     category: '',
     image: '',
-    read_time: '5 min read',
     faqs: []
   });
 
@@ -557,7 +556,6 @@ const BlogTab = () => {
       author: post.author,
       category: post.category,
       image: post.image,
-      read_time: post.read_time,
       faqs: post.faqs || []
     });
     setIsHtmlMode(false);
@@ -585,7 +583,6 @@ const BlogTab = () => {
       author: 'Rushabh Ventures Team',
       category: '',
       image: '',
-      read_time: '5 min read',
       faqs: []
     });
   };
@@ -865,7 +862,7 @@ const BlogTab = () => {
               </div>
             </div>
 
-            <div style={{ display: 'grid', gridTemplateColumns: '1fr 1fr 1fr', gap: '20px', marginBottom: '20px' }}>
+            <div style={{ display: 'grid', gridTemplateColumns: '1fr 1fr', gap: '20px', marginBottom: '20px' }}>
               <div>
                 <label style={labelStyle}>Category *</label>
                 <input
@@ -888,17 +885,6 @@ const BlogTab = () => {
                   style={inputStyle}
                 />
               </div>
-              <div>
-                <label style={labelStyle}>Read Time</label>
-                <input
-                  type="text"
-                  name="read_time"
-                  value={formData.read_time}
-                  onChange={handleInputChange}
-                  style={inputStyle}
-                  placeholder="5 min read"
-                />
-              </div>
             </div>
 
             {/* Featured Image Section */}
@@ -6,6 +6,9 @@ import { getContacts, updateContact, deleteContact } from '../../../utils/adminA
 const ContactsTab = () => {
   const [contacts, setContacts] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [totalCount, setTotalCount] = useState(0);
   const [searchTerm, setSearchTerm] = useState('');
   const [statusFilter, setStatusFilter] = useState('all');
   const [editingId, setEditingId] = useState(null);
@@ -14,12 +17,17 @@ const ContactsTab = () => {
 
   useEffect(() => {
     fetchContacts();
-  }, []);
+  }, [statusFilter]);
+
+  // Status filtering happens on the server so totals and paging stay correct
+  const pageFilters = () => ({ status: statusFilter === 'all' ? undefined : statusFilter });
 
   const fetchContacts = async () => {
     try {
-      const data = await getContacts();
-      setContacts(data);
+      const page = await getContacts(pageFilters());
+      setContacts(page.items);
+      setNextCursor(page.nextCursor);
+      setTotalCount(page.total);
     } catch (error) {
       toast.error('Failed to load contacts');
     } finally {
@@ -27,12 +35,27 @@ const ContactsTab = () => {
     }
   };
 
+  const loadMore = async () => {
+    setLoadingMore(true);
+    try {
+      const page = await getContacts({ ...pageFilters(), after: nextCursor });
+      setContacts(prev => [...prev, ...page.items]);
+      setNextCursor(page.nextCursor);
+      setTotalCount(page.total);
+    } catch (error) {
+      toast.error('Failed to load more contacts');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleUpdateStatus = async (id) => {
     try {
       await updateContact(id, { status: editStatus, notes: editNotes });
       toast.success('Contact updated');
       setEditingId(null);
-      fetchContacts();
+      // Update in place so the pages loaded so far stay loaded
+      setContacts(prev => prev.map(item => item.id === id ? { ...item, status: editStatus, notes: editNotes } : item));
     } catch (error) {
       toast.error('Failed to update contact');
     }
@@ -44,7 +67,8 @@ const ContactsTab = () => {
     try {
       await deleteContact(id);
       toast.success('Contact deleted');
-      fetchContacts();
+      setContacts(prev => prev.filter(item => item.id !== id));
+      setTotalCount(prev => prev - 1);
     } catch (error) {
       toast.error('Failed to delete contact');
     }
@@ -61,8 +85,7 @@ const ContactsTab = () => {
       contact.name?.toLowerCase().includes(searchTerm.toLowerCase()) ||
       contact.company_name?.toLowerCase().includes(searchTerm.toLowerCase()) ||
       contact.email?.toLowerCase().includes(searchTerm.toLowerCase());
-    const matchesStatus = statusFilter === 'all' || contact.status === statusFilter;
-    return matchesSearch && matchesStatus;
+    return matchesSearch;
   });
 
   const statusOptions = ['pending', 'contacted', 'converted', 'rejected'];
@@ -108,7 +131,7 @@ const ContactsTab = () => {
             Contacts
           </h1>
           <p style={{ color: '#6B7280', fontSize: '14px' }}>
-            {filteredContacts.length} total contacts
+            Showing {filteredContacts.length} of {totalCount} contacts
           </p>
         </div>
 
@@ -277,6 +300,14 @@ const ContactsTab = () => {
           </table>
         </div>
       </div>
+
+      {nextCursor && (
+        <div style={{ display: 'flex', justifyContent: 'center', marginTop: '20px' }}>
+          <button onClick={loadMore} disabled={loadingMore} style={loadMoreBtnStyle}>
+            {loadingMore ? 'Loading...' : `Load more (${totalCount - contacts.length} remaining)`}
+          </button>
+        </div>
+      )}
     </div>
   );
 };
@@ -297,6 +328,16 @@ const tdStyle = {
   fontSize: '14px'
 };
 
+const loadMoreBtnStyle = {
+  padding: '10px 24px',
+  background: 'rgba(212, 175, 55, 0.1)',
+  border: '1px solid rgba(212, 175, 55, 0.3)',
+  color: '#D4AF37',
+  fontSize: '14px',
+  fontWeight: '600',
+  cursor: 'pointer'
+};
+
 const actionBtnStyle = {
   background: 'none',
   border: 'none',
@@ -6,6 +6,9 @@ import { getFiles, uploadFile, deleteFile, getFileUrl } from '../../../utils/adm
 const FilesTab = () => {
   const [files, setFiles] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [totalCount, setTotalCount] = useState(0);
   const [uploading, setUploading] = useState(false);
   const [searchTerm, setSearchTerm] = useState('');
   const [typeFilter, setTypeFilter] = useState('all');
@@ -13,12 +16,17 @@ const FilesTab = () => {
 
   useEffect(() => {
     fetchFiles();
-  }, []);
+  }, [typeFilter]);
+
+  // Type filtering happens on the server so totals and paging stay correct
+  const pageFilters = () => ({ type: typeFilter === 'all' ? undefined : typeFilter });
 
   const fetchFiles = async () => {
     try {
-      const data = await getFiles();
-      setFiles(data);
+      const page = await getFiles(pageFilters());
+      setFiles(page.items);
+      setNextCursor(page.nextCursor);
+      setTotalCount(page.total);
     } catch (error) {
       toast.error('Failed to load files');
     } finally {
@@ -26,6 +34,20 @@ const FilesTab = () => {
     }
   };
 
+  const loadMore = async () => {
+    setLoadingMore(true);
+    try {
+      const page = await getFiles({ ...pageFilters(), after: nextCursor });
+      setFiles(prev => [...prev, ...page.items]);
+      setNextCursor(page.nextCursor);
+      setTotalCount(page.total);
+    } catch (error) {
+      toast.error('Failed to load more files');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleFileSelect = async (e) => {
     const selectedFiles = Array.from(e.target.files);
     if (selectedFiles.length === 0) return;
@@ -52,7 +74,8 @@ const FilesTab = () => {
     try {
       await deleteFile(filename);
       toast.success('File deleted');
-      fetchFiles();
+      setFiles(prev => prev.filter(file => file.name !== filename));
+      setTotalCount(prev => prev - 1);
     } catch (error) {
       toast.error('Failed to delete file');
     }
@@ -81,9 +104,7 @@ const FilesTab = () => {
   };
 
   const filteredFiles = files.filter(file => {
-    const matchesSearch = file.name.toLowerCase().includes(searchTerm.toLowerCase());
-    const matchesType = typeFilter === 'all' || file.type === typeFilter;
-    return matchesSearch && matchesType;
+    return file.name.toLowerCase().includes(searchTerm.toLowerCase());
   });
 
   if (loading) {
@@ -122,7 +143,7 @@ const FilesTab = () => {
             File Manager
           </h1>
           <p style={{ color: '#6B7280', fontSize: '14px' }}>
-            {filteredFiles.length} files
+            Showing {filteredFiles.length} of {totalCount} files
           </p>
         </div>
 
@@ -270,7 +291,7 @@ const FilesTab = () => {
               }}>
                 {file.type === 'image' ? (
                   <img
-                    src={getFileUrl(file.name)}
+                    src={getFileUrl(file.name, 320)}
                     alt={file.name}
                     style={{
                       maxWidth: '100%',
@@ -369,6 +390,26 @@ const FilesTab = () => {
           ))}
         </div>
       )}
+
+      {nextCursor && (
+        <div style={{ display: 'flex', justifyContent: 'center', marginTop: '20px' }}>
+          <button
+            onClick={loadMore}
+            disabled={loadingMore}
+            style={{
+              padding: '10px 24px',
+              background: 'rgba(212, 175, 55, 0.1)',
+              border: '1px solid rgba(212, 175, 55, 0.3)',
+              color: '#D4AF37',
+              fontSize: '14px',
+              fontWeight: '600',
+              cursor: 'pointer'
+            }}
+          >
+            {loadingMore ? 'Loading...' : `Load more (${totalCount - files.length} remaining)`}
+          </button>
+        </div>
+      )}
     </div>
   );
 };
@@ -50,6 +50,24 @@ export const adminLogout = () => {
   localStorage.removeItem('adminEmail');
 };
 
+// Fetch one page of an admin list; the next page cursor and the total
+// number of matching rows come back in response headers
+const fetchPage = async (path, params, errorMessage) => {
+  const query = new URLSearchParams(
+    Object.entries(params).filter(([, value]) => value !== undefined && value !== null && value !== '')
+  ).toString();
+  const response = await fetch(`${API_BASE}${path}${query ? `?${query}` : ''}`, {
+    headers: { ...getAuthHeader() },
+  });
+
+  if (!response.ok) throw new Error(errorMessage);
+  return {
+    items: await response.json(),
+    nextCursor: response.headers.get('X-Next-Cursor'),
+    total: Number(response.headers.get('X-Total-Count') || 0),
+  };
+};
+
 // Get dashboard stats
 export const getAdminStats = async () => {
   const response = await fetch(`${API_BASE}/api/admin/stats`, {
@@ -60,14 +78,9 @@ export const getAdminStats = async () => {
   return response.json();
 };
 
-// Contacts
-export const getContacts = async () => {
-  const response = await fetch(`${API_BASE}/api/admin/contacts`, {
-    headers: { ...getAuthHeader() },
-  });
-
-  if (!response.ok) throw new Error('Failed to fetch contacts');
-  return response.json();
+// Contacts (one page at a time, newest first)
+export const getContacts = async ({ after, status } = {}) => {
+  return fetchPage('/api/admin/contacts', { after, status }, 'Failed to fetch contacts');
 };
 
 export const updateContact = async (id, data) => {
@@ -91,14 +104,9 @@ export const deleteContact = async (id) => {
   return response.json();
 };
 
-// Applications
-export const getApplications = async () => {
-  const response = await fetch(`${API_BASE}/api/admin/applications`, {
-    headers: { ...getAuthHeader() },
-  });
-
-  if (!response.ok) throw new Error('Failed to fetch applications');
-  return response.json();
+// Applications (one page at a time, newest first)
+export const getApplications = async ({ after, status } = {}) => {
+  return fetchPage('/api/admin/applications', { after, status }, 'Failed to fetch applications');
 };
 
 export const updateApplication = async (id, data) => {
@@ -170,14 +178,9 @@ export const deleteBlogPost = async (slug) => {
   return response.json();
 };
 
-// Files
-export const getFiles = async () => {
-  const response = await fetch(`${API_BASE}/api/admin/files`, {
-    headers: { ...getAuthHeader() },
-  });
-
-  if (!response.ok) throw new Error('Failed to fetch files');
-  return response.json();
+// Files (one page at a time, newest first)
+export const getFiles = async ({ after, type } = {}) => {
+  return fetchPage('/api/admin/files', { after, type }, 'Failed to fetch files');
 };
 
 export const uploadFile = async (file) => {
@@ -204,6 +207,7 @@ export const deleteFile = async (filename) => {
   return response.json();
 };
 
-export const getFileUrl = (filename) => {
-  return `${API_BASE}/api/files/${filename}`;
+export const getFileUrl = (filename, width) => {
+  const url = `${API_BASE}/api/files/${filename}`;
+  return width ? `${url}?w=${width}` : url;
 };